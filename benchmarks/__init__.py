@@ -0,0 +1 @@
+"""Benchmarks for the Google Air Quality API client."""
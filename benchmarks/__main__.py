@@ -0,0 +1,45 @@
+"""Run all benchmarks and write the results as JSON.
+
+Run with ``python -m benchmarks [--quick] [--output results.json]``.
+"""
+
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+
+from . import memory, parsing, throughput, tracing
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--quick", action="store_true", help="run fewer iterations, e.g. in CI"
+    )
+    parser.add_argument("--output", type=Path, help="file to write, default stdout")
+    args = parser.parse_args()
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [
+            *memory.run(),
+            *parsing.run(number=10 if args.quick else 100),
+            *throughput.run(requests=200 if args.quick else 2000),
+            *tracing.run(
+                number=10000 if args.quick else 100000,
+                requests=100 if args.quick else 500,
+            ),
+        ],
+    }
+    output = json.dumps(results, indent=2)
+    if args.output is None:
+        sys.stdout.write(output + "\n")
+    else:
+        args.output.write_text(output + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
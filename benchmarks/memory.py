@@ -0,0 +1,44 @@
+"""Measure the memory held by deserialized forecasts.
+
+Run with ``python -m benchmarks.memory``. The result is printed as JSON.
+"""
+
+import json
+import tracemalloc
+from typing import Any
+
+from google_air_quality_api.model import AirQualityForecastData
+
+from .synthetic import forecast_response
+
+FORECAST_HOURS = 96
+FORECASTS = 200
+
+
+def bytes_per_forecast(hours: int = FORECAST_HOURS, count: int = FORECASTS) -> float:
+    """Return the average traced allocation size of one cached forecast."""
+    response = forecast_response(hours)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        cached = [AirQualityForecastData.from_dict(response) for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del cached
+    return (after - before) / count
+
+
+def run() -> list[dict[str, Any]]:
+    """Return the benchmark results."""
+    return [
+        {
+            "benchmark": "memory",
+            "forecast_hours": FORECAST_HOURS,
+            "bytes_per_forecast": round(bytes_per_forecast()),
+        }
+    ]
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))  # noqa: T201
@@ -0,0 +1,113 @@
+"""Measure deserialization time and allocations of API responses.
+
+Run with ``python -m benchmarks.parsing``. The results are printed as JSON.
+"""
+
+import json
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from google_air_quality_api.mapping import AQICategoryMapping
+from google_air_quality_api.model import (
+    AirQualityCurrentConditionsData,
+    AirQualityForecastData,
+    lookup_normalized_generic,
+)
+
+from .synthetic import MAX_POLLUTANTS, current_conditions_response, forecast_response
+
+FORECAST_HOURS = (1, 24, 96)
+POLLUTANT_COUNTS = (1, 6, MAX_POLLUTANTS)
+REPEAT = 5
+
+
+def _seconds_per_call(func: Callable[[], Any], number: int) -> float:
+    """Return the best time of one call over several repeats."""
+    return min(timeit.repeat(func, number=number, repeat=REPEAT)) / number
+
+
+def _allocations(func: Callable[[], Any]) -> dict[str, int]:
+    """Return the peak and retained traced memory of one call."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"peak_bytes": peak - before, "retained_bytes": current - before}
+
+
+def forecast_results(number: int) -> list[dict[str, Any]]:
+    """Benchmark AirQualityForecastData.from_json."""
+    results = []
+    for hours in FORECAST_HOURS:
+        for pollutant_count in POLLUTANT_COUNTS:
+            body = json.dumps(forecast_response(hours, pollutant_count=pollutant_count))
+
+            def parse(body: str = body) -> AirQualityForecastData:
+                return AirQualityForecastData.from_json(body)
+
+            results.append(
+                {
+                    "benchmark": "forecast_from_json",
+                    "forecast_hours": hours,
+                    "pollutants": pollutant_count,
+                    "body_bytes": len(body),
+                    "seconds_per_call": _seconds_per_call(
+                        parse, max(1, number // hours)
+                    ),
+                    **_allocations(parse),
+                }
+            )
+    return results
+
+
+def laqi_results(number: int) -> list[dict[str, Any]]:
+    """Benchmark AirQualityCurrentConditionsData.from_json for every LAQI."""
+    results = []
+    for laqi in AQICategoryMapping.get_all_laq_indices():
+        body = json.dumps(current_conditions_response(laqi))
+
+        def parse(body: str = body) -> AirQualityCurrentConditionsData:
+            return AirQualityCurrentConditionsData.from_json(body)
+
+        results.append(
+            {
+                "benchmark": "current_conditions_from_json",
+                "laqi": laqi,
+                "seconds_per_call": _seconds_per_call(parse, number),
+            }
+        )
+    return results
+
+
+def lookup_results(number: int) -> list[dict[str, Any]]:
+    """Benchmark lookup_normalized_generic over all known categories."""
+    originals = [category.original for category in AQICategoryMapping.get_all()]
+
+    def lookup() -> None:
+        for original in originals:
+            lookup_normalized_generic(original)
+
+    return [
+        {
+            "benchmark": "lookup_normalized_generic",
+            "categories": len(originals),
+            "seconds_per_call": _seconds_per_call(lookup, max(1, number // 10))
+            / len(originals),
+        }
+    ]
+
+
+def run(number: int = 100) -> list[dict[str, Any]]:
+    """Return the benchmark results."""
+    return forecast_results(number) + laqi_results(number) + lookup_results(number)
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))  # noqa: T201
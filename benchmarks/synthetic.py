@@ -0,0 +1,91 @@
+"""Synthetic API responses scaled up from the deu_uba fixtures."""
+
+import copy
+import json
+from datetime import UTC, datetime, timedelta
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from google_air_quality_api.mapping import AQICategoryMapping
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+MAX_POLLUTANTS = 10
+
+# Pollutants reported by some LAQIs but missing from the deu_uba fixtures.
+EXTRA_POLLUTANTS = [
+    ("nh3", "NH3", "Ammonia", "PARTS_PER_BILLION"),
+    ("no", "NO", "Nitrogen monoxide", "PARTS_PER_BILLION"),
+    ("c6h6", "C6H6", "Benzene", "MICROGRAMS_PER_CUBIC_METER"),
+    ("nox", "NOX", "Nitrogen oxides", "PARTS_PER_BILLION"),
+]
+
+
+@cache
+def _fixture(name: str) -> dict[str, Any]:
+    """Load a fixture."""
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+def pollutants(count: int) -> list[dict[str, Any]]:
+    """Return count pollutant entries."""
+    entries = copy.deepcopy(_fixture("deu_uba_current_conditions.json")["pollutants"])
+    for offset, (code, display_name, full_name, units) in enumerate(EXTRA_POLLUTANTS):
+        entries.append(
+            {
+                "code": code,
+                "displayName": display_name,
+                "fullName": full_name,
+                "concentration": {"value": 1.0 + offset, "units": units},
+            }
+        )
+    return entries[:count]
+
+
+def indexes(laqi: str) -> list[dict[str, Any]]:
+    """Return the UAQI and a local AQI index entry."""
+    uaqi, local = copy.deepcopy(
+        _fixture("deu_uba_current_conditions.json")["indexes"]
+    )
+    categories = AQICategoryMapping.get(laqi) or []
+    local["code"] = laqi
+    local["displayName"] = f"AQI ({laqi})"
+    local["aqi"] = 2
+    if categories:
+        local["category"] = categories[len(categories) // 2].original
+    return [uaqi, local]
+
+
+def hour(date_time: datetime, laqi: str, pollutant_count: int) -> dict[str, Any]:
+    """Return one hourly record."""
+    return {
+        "dateTime": date_time.isoformat(),
+        "indexes": indexes(laqi),
+        "pollutants": pollutants(pollutant_count),
+    }
+
+
+def current_conditions_response(
+    laqi: str = "deu_uba", pollutant_count: int = 6
+) -> dict[str, Any]:
+    """Return a current conditions response."""
+    date_time = datetime.fromisoformat(
+        _fixture("deu_uba_current_conditions.json")["dateTime"]
+    )
+    return {"regionCode": "de", **hour(date_time, laqi, pollutant_count)}
+
+
+def forecast_response(
+    hours: int, laqi: str = "deu_uba", pollutant_count: int = 6
+) -> dict[str, Any]:
+    """Return a forecast response with the given number of hours."""
+    start = datetime.fromisoformat(
+        _fixture("deu_uba_forecast.json")["hourlyForecasts"][0]["dateTime"]
+    ).astimezone(UTC)
+    return {
+        "hourlyForecasts": [
+            hour(start + timedelta(hours=offset), laqi, pollutant_count)
+            for offset in range(hours)
+        ],
+        "regionCode": "de",
+    }
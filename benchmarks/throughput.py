@@ -0,0 +1,75 @@
+"""Measure end-to-end request throughput against a local stub server.
+
+Run with ``python -m benchmarks.throughput``. The results are printed as JSON.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any
+
+from aiohttp import ClientSession, TCPConnector, web
+
+from google_air_quality_api.api import GoogleAirQualityApi
+from google_air_quality_api.auth import Auth
+
+from .synthetic import current_conditions_response
+
+CONCURRENCY_LEVELS = (1, 8, 32, 128)
+
+
+async def _serve() -> tuple[web.AppRunner, str]:
+    """Start a stub current conditions endpoint and return its base url."""
+    body = json.dumps(current_conditions_response()).encode()
+
+    async def handler(_: web.Request) -> web.Response:
+        return web.Response(body=body, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_post("/v1/currentConditions:lookup", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/v1"
+
+
+async def _run(requests: int) -> list[dict[str, Any]]:
+    """Run the requests at every concurrency level."""
+    runner, host = await _serve()
+    results = []
+    try:
+        for concurrency in CONCURRENCY_LEVELS:
+            connector = TCPConnector(limit=concurrency)
+            async with ClientSession(connector=connector) as session:
+                api = GoogleAirQualityApi(Auth(session, "benchmark", host=host))
+                locations = [(index * 0.001, 0.0) for index in range(requests)]
+                start = time.perf_counter()
+                responses = await api.async_get_current_conditions_batch(
+                    locations, max_concurrency=concurrency
+                )
+                elapsed = time.perf_counter() - start
+            errors = sum(isinstance(response, Exception) for response in responses)
+            results.append(
+                {
+                    "benchmark": "current_conditions_throughput",
+                    "concurrency": concurrency,
+                    "requests": requests,
+                    "errors": errors,
+                    "seconds": elapsed,
+                    "requests_per_second": requests / elapsed,
+                }
+            )
+    finally:
+        await runner.cleanup()
+    return results
+
+
+def run(requests: int = 2000) -> list[dict[str, Any]]:
+    """Return the benchmark results."""
+    return asyncio.run(_run(requests))
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))  # noqa: T201
@@ -0,0 +1,112 @@
+"""Measure the overhead of tracing API calls.
+
+Run with ``python -m benchmarks.tracing``. The results are printed as JSON.
+Tracers that need OpenTelemetry are skipped when it is not installed.
+"""
+
+import asyncio
+import contextlib
+import json
+import time
+import timeit
+from collections.abc import Iterator
+from typing import Any
+
+from aiohttp import ClientSession
+
+from google_air_quality_api import tracing
+from google_air_quality_api.api import GoogleAirQualityApi
+from google_air_quality_api.auth import Auth
+from google_air_quality_api.testing import AirQualityEmulator
+
+REPEAT = 5
+
+
+def _tracers() -> Iterator[tuple[str, object]]:
+    """Yield the tracers to compare, None meaning tracing is disabled."""
+    yield "noop", None
+    if not tracing.TRACING_AVAILABLE:
+        return
+    from opentelemetry import trace  # noqa: PLC0415
+
+    yield "otel_api", trace.NoOpTracerProvider().get_tracer(tracing.TRACER_NAME)
+    try:
+        from opentelemetry.sdk.trace import TracerProvider  # noqa: PLC0415
+    except ImportError:
+        return
+    # Spans are recorded but not exported, leaving only the tracing cost.
+    yield "otel_sdk", TracerProvider().get_tracer(tracing.TRACER_NAME)
+
+
+@contextlib.contextmanager
+def _use_tracer(tracer: object) -> Iterator[None]:
+    """Trace with tracer while the context is entered."""
+    previous = tracing._TRACER  # noqa: SLF001
+    tracing._TRACER = tracer  # noqa: SLF001
+    try:
+        yield
+    finally:
+        tracing._TRACER = previous  # noqa: SLF001
+
+
+def span_results(number: int) -> list[dict[str, Any]]:
+    """Benchmark entering and leaving a single span."""
+
+    def baseline() -> None:
+        with contextlib.nullcontext():
+            pass
+
+    def traced() -> None:
+        with tracing.span(tracing.REQUEST_SPAN) as span:
+            span.is_recording()
+
+    base = min(timeit.repeat(baseline, number=number, repeat=REPEAT)) / number
+    results = []
+    for name, tracer in _tracers():
+        with _use_tracer(tracer):
+            seconds = min(timeit.repeat(traced, number=number, repeat=REPEAT)) / number
+        results.append(
+            {
+                "benchmark": "tracing_span",
+                "tracer": name,
+                "seconds_per_span": seconds,
+                "overhead_seconds": seconds - base,
+            }
+        )
+    return results
+
+
+async def _lookup_results(requests: int) -> list[dict[str, Any]]:
+    """Benchmark current conditions lookups against the emulator."""
+    emulator = AirQualityEmulator()
+    host = await emulator.async_start()
+    results = []
+    try:
+        async with ClientSession() as session:
+            api = GoogleAirQualityApi(Auth(session, "benchmark", host=host))
+            for name, tracer in _tracers():
+                with _use_tracer(tracer):
+                    start = time.perf_counter()
+                    for _ in range(requests):
+                        await api.async_get_current_conditions(52.52, 13.40)
+                    elapsed = time.perf_counter() - start
+                results.append(
+                    {
+                        "benchmark": "tracing_lookup",
+                        "tracer": name,
+                        "requests": requests,
+                        "seconds_per_request": elapsed / requests,
+                    }
+                )
+    finally:
+        await emulator.async_stop()
+    return results
+
+
+def run(number: int = 100000, requests: int = 500) -> list[dict[str, Any]]:
+    """Return the benchmark results."""
+    return span_results(number) + asyncio.run(_lookup_results(requests))
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))  # noqa: T201
@@ -3,6 +3,19 @@
 __all__ = [
     "api",
     "auth",
+    "cache",
+    "cli",
+    "columns",
     "exceptions",
+    "geohash",
+    "grid",
+    "metrics",
     "model",
+    "ratelimit",
+    "retry",
+    "store",
+    "sync",
+    "testing",
+    "tiles",
+    "tracing",
 ]
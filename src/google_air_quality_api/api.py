@@ -1,75 +1,522 @@
 """API for Google Air Quality bound to Home Assistant OAuth."""
 
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Iterable, Iterator, Mapping
 from datetime import UTC, datetime, timedelta
-from typing import NotRequired, TypedDict
+from typing import Any, NamedTuple, NotRequired, TypedDict, TypeVar
 
 from .auth import Auth
-from .exceptions import InvalidCustomLAQIConfigurationError
-from .model import AirQualityCurrentConditionsData, AirQualityForecastData
+from .exceptions import GoogleAirQualityApiError, InvalidCustomLAQIConfigurationError
+from .mapping import AQICategoryMapping
+from .model import (
+    AirQualityCurrentConditionsData,
+    AirQualityForecastData,
+    AirQualityHistoryData,
+    LazyAirQualityForecastData,
+    LazyHourlyList,
+)
+from .tiles import TileCache, tile_path
+from .tracing import (
+    CURRENT_CONDITIONS_SPAN,
+    FORECAST_SPAN,
+    LAQI_ATTRIBUTE,
+    REGION_CODE_ATTRIBUTE,
+    Span,
+    span,
+)
 
 INVALID_CUSTOM_AQI_COMBINATION = (
     "Both region_code and custom_local_aqi must be provided together, or neither."
 )
+UNSUPPORTED_CUSTOM_AQI = "Unsupported custom local AQI"
+INVALID_MAX_CONCURRENCY = "max_concurrency must be at least 1"
+INVALID_HISTORY_RANGE = "Exactly one of hours or period must be provided."
+HISTORY_RANGE_TOO_LONG = "The history range must not be longer than"
+EMPTY_HISTORY_RANGE = "The history range must end after it starts"
+INVALID_PREFETCH = "prefetch must be at least 1"
+INVALID_PAGE_SIZE = "page_size must be at least 1"
+DEFAULT_MAX_CONCURRENCY = 10
+FORECAST_MAX_HOURS = 96
+DEFAULT_FORECAST_PAGE_SIZE = FORECAST_MAX_HOURS
+HISTORY_MAX_HOURS = 720
+DEFAULT_HISTORY_PAGE_SIZE = 72
+DEFAULT_HISTORY_PREFETCH = 2
+
+# The universal AQI is always reported and cannot be requested as a local one.
+_SUPPORTED_CUSTOM_AQIS = frozenset(AQICategoryMapping.get_all_laq_indices()) - {"uaqi"}
+CurrentConditionsResult = AirQualityCurrentConditionsData | GoogleAirQualityApiError
+_PageT = TypeVar(
+    "_PageT",
+    bound=AirQualityForecastData | LazyAirQualityForecastData | AirQualityHistoryData,
+)
+
 
+class ProfilePayload(TypedDict):
+    """Part of a lookup payload set by a request profile."""
 
-class CurrentConditionsPayload(TypedDict):
+    extraComputations: NotRequired[list[str]]
+    universalAqi: bool
+    languageCode: NotRequired[str]
+    uaqiColorPalette: NotRequired[str]
+
+
+class CurrentConditionsPayload(ProfilePayload):
     """Payload for current conditions API request."""
 
     location: dict[str, float]
-    extraComputations: list[str]
-    universalAqi: bool
     customLocalAqis: NotRequired[list[dict[str, str]]]
 
 
+class RequestProfile(NamedTuple):
+    """Optional parts of a lookup response to request.
+
+    extra_computations are values of the API's extraComputations, e.g.
+    LOCAL_AQI, POLLUTANT_CONCENTRATION or HEALTH_RECOMMENDATIONS.
+    uaqi_color_palette is one of RED_GREEN, INDIGO_PERSIAN_DARK or
+    INDIGO_PERSIAN_LIGHT.
+    """
+
+    extra_computations: tuple[str, ...] = ("LOCAL_AQI", "POLLUTANT_CONCENTRATION")
+    universal_aqi: bool = True
+    language_code: str | None = None
+    uaqi_color_palette: str | None = None
+
+    def as_payload(self) -> ProfilePayload:
+        """Return the profile as sent to the API."""
+        payload: ProfilePayload = {"universalAqi": self.universal_aqi}
+        if self.extra_computations:
+            payload["extraComputations"] = list(self.extra_computations)
+        if self.language_code is not None:
+            payload["languageCode"] = self.language_code
+        if self.uaqi_color_palette is not None:
+            payload["uaqiColorPalette"] = self.uaqi_color_palette
+        return payload
+
+
+DEFAULT_PROFILE = RequestProfile()
+# Only the universal AQI, e.g. for map pins; no pollutant or local AQI blocks.
+LEAN_PROFILE = RequestProfile(extra_computations=())
+
+
+class CurrentConditionsRequest(NamedTuple):
+    """A single location of a batch current conditions lookup."""
+
+    lat: float
+    lon: float
+    region_code: str | None = None
+    custom_local_aqi: str | None = None
+    custom_local_aqis: Mapping[str, str] | None = None
+
+
+class Period(NamedTuple):
+    """A time range of hourly records."""
+
+    start_time: datetime
+    end_time: datetime
+
+    def as_payload(self) -> dict[str, str]:
+        """Return the period as sent to the API."""
+        return {
+            "startTime": self.start_time.isoformat(),
+            "endTime": self.end_time.isoformat(),
+        }
+
+
+def _current_hour() -> datetime:
+    """Return the start of the current hour."""
+    return datetime.now(tz=UTC).replace(minute=0, second=0, microsecond=0)
+
+
+def _lookup_payload(
+    lat: float, lon: float, profile: RequestProfile
+) -> CurrentConditionsPayload:
+    """Return the common part of a lookup request payload."""
+    return {"location": {"latitude": lat, "longitude": lon}, **profile.as_payload()}
+
+
+def _custom_local_aqis(
+    region_code: str | None,
+    custom_local_aqi: str | None,
+    custom_local_aqis: Mapping[str, str] | None,
+) -> list[dict[str, str]]:
+    """Return the validated customLocalAqis of a request."""
+    if (region_code is None) ^ (custom_local_aqi is None):
+        raise InvalidCustomLAQIConfigurationError(INVALID_CUSTOM_AQI_COMBINATION)
+    by_region = dict(custom_local_aqis or {})
+    if region_code and custom_local_aqi:
+        by_region = {region_code: custom_local_aqi, **by_region}
+    for laqi in by_region.values():
+        if laqi not in _SUPPORTED_CUSTOM_AQIS:
+            message = f"{UNSUPPORTED_CUSTOM_AQI}: {laqi}"
+            raise InvalidCustomLAQIConfigurationError(message)
+    return [{"regionCode": region, "aqi": laqi} for region, laqi in by_region.items()]
+
+
+def _set_span_attributes(
+    current_span: Span, region_code: str | None, laqi: str | None
+) -> None:
+    """Set the region and local AQI attributes of a recording span."""
+    if region_code is not None:
+        current_span.set_attribute(REGION_CODE_ATTRIBUTE, region_code)
+    if laqi is not None:
+        current_span.set_attribute(LAQI_ATTRIBUTE, laqi)
+
+
+def _forecast_period() -> Period:
+    """Return the forecast horizon, from the next full hour to its end."""
+    current_hour = _current_hour()
+    return Period(
+        current_hour + timedelta(hours=1),
+        current_hour + timedelta(hours=FORECAST_MAX_HOURS),
+    )
+
+
+def _history_period(hours: int | None, period: Period | None) -> Period:
+    """Return the period of a history lookup."""
+    if period is None:
+        if hours is None:
+            raise ValueError(INVALID_HISTORY_RANGE)
+        end_time = _current_hour()
+        period = Period(end_time - timedelta(hours=hours), end_time)
+    elif hours is not None:
+        raise ValueError(INVALID_HISTORY_RANGE)
+    if period.start_time >= period.end_time:
+        raise ValueError(EMPTY_HISTORY_RANGE)
+    if period.end_time - period.start_time > timedelta(hours=HISTORY_MAX_HOURS):
+        message = f"{HISTORY_RANGE_TOO_LONG} {HISTORY_MAX_HOURS} hours"
+        raise ValueError(message)
+    return period
+
+
 class GoogleAirQualityApi:
     """The Google Air Quality library api client."""
 
-    def __init__(self, auth: Auth) -> None:
-        """Initialize GoogleAirQualityApi."""
+    def __init__(
+        self,
+        auth: Auth,
+        *,
+        tile_cache: TileCache | None = None,
+        profile: RequestProfile = DEFAULT_PROFILE,
+    ) -> None:
+        """Initialize GoogleAirQualityApi.
+
+        profile is used by lookups that are not given a profile of their own.
+        """
         self._auth = auth
+        self._tile_cache = tile_cache
+        self._profile = profile
 
-    async def async_get_current_conditions(
+    async def async_get_current_conditions(  # noqa: PLR0913
         self,
         lat: float,
         lon: float,
         region_code: str | None = None,
         custom_local_aqi: str | None = None,
+        custom_local_aqis: Mapping[str, str] | None = None,
+        *,
+        profile: RequestProfile | None = None,
     ) -> AirQualityCurrentConditionsData:
-        """Get all air quality data."""
-        payload: CurrentConditionsPayload = {
-            "location": {"latitude": lat, "longitude": lon},
-            "extraComputations": [
-                "LOCAL_AQI",
-                "POLLUTANT_CONCENTRATION",
-            ],
-            "universalAqi": True,
-        }
-        if (region_code is None) ^ (custom_local_aqi is None):
-            raise InvalidCustomLAQIConfigurationError(INVALID_CUSTOM_AQI_COMBINATION)
-        if region_code and custom_local_aqi:
-            payload["customLocalAqis"] = [
-                {"regionCode": region_code, "aqi": custom_local_aqi}
-            ]
-        return await self._auth.post_json(
-            "currentConditions:lookup",
-            json=payload,
-            data_cls=AirQualityCurrentConditionsData,
-        )
+        """Get all air quality data.
+
+        custom_local_aqis maps region codes to the local AQI to report for
+        locations in that region, in addition to region_code and
+        custom_local_aqi. Unsupported local AQIs are rejected before sending.
+        """
+        payload = _lookup_payload(lat, lon, profile or self._profile)
+        if custom := _custom_local_aqis(
+            region_code, custom_local_aqi, custom_local_aqis
+        ):
+            payload["customLocalAqis"] = custom
+        with span(CURRENT_CONDITIONS_SPAN) as current_span:
+            result = await self._auth.post_json(
+                "currentConditions:lookup",
+                json=payload,
+                data_cls=AirQualityCurrentConditionsData,
+            )
+            if current_span.is_recording():
+                laqi = result.indexes.laqi
+                _set_span_attributes(
+                    current_span,
+                    result.region_code or region_code,
+                    custom_local_aqi if laqi is None else laqi.code,
+                )
+            return result
 
     async def async_get_forecast(
-        self, lat: float, lon: float, forecast_timedelta: timedelta
+        self,
+        lat: float,
+        lon: float,
+        forecast_timedelta: timedelta,
+        *,
+        profile: RequestProfile | None = None,
     ) -> AirQualityForecastData:
         """Get air quality forecast data."""
         forecast_date_time = datetime.now(tz=UTC) + forecast_timedelta
         payload = {
-            "location": {"latitude": lat, "longitude": lon},
-            "extraComputations": [
-                "LOCAL_AQI",
-                "POLLUTANT_CONCENTRATION",
-            ],
-            "universalAqi": True,
+            **_lookup_payload(lat, lon, profile or self._profile),
             "dateTime": forecast_date_time.isoformat(),
         }
-        return await self._auth.post_json(
-            "forecast:lookup", json=payload, data_cls=AirQualityForecastData
+        with span(FORECAST_SPAN) as forecast_span:
+            result = await self._auth.post_json(
+                "forecast:lookup", json=payload, data_cls=AirQualityForecastData
+            )
+            if forecast_span.is_recording():
+                laqi = None
+                if result.hourly_forecasts:
+                    index = result.hourly_forecasts[0].indexes.laqi
+                    laqi = None if index is None else index.code
+                _set_span_attributes(forecast_span, result.region_code, laqi)
+            return result
+
+    async def async_get_current_conditions_batch(
+        self,
+        requests: Iterable[CurrentConditionsRequest | tuple],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        profile: RequestProfile | None = None,
+    ) -> list[CurrentConditionsResult]:
+        """Get current conditions for many locations.
+
+        Results are returned in input order. Errors raised by the API for a
+        single location are returned in place of its result.
+        """
+        results: dict[int, CurrentConditionsResult] = {
+            index: result
+            async for index, result in self.async_iter_current_conditions(
+                requests, max_concurrency=max_concurrency, profile=profile
+            )
+        }
+        return [results[index] for index in range(len(results))]
+
+    async def async_iter_current_conditions(
+        self,
+        requests: Iterable[CurrentConditionsRequest | tuple],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        profile: RequestProfile | None = None,
+    ) -> AsyncIterator[tuple[int, CurrentConditionsResult]]:
+        """Yield (input index, result) pairs as lookups complete.
+
+        At most max_concurrency lookups are in flight at once and the input is
+        consumed lazily, so large iterables are never materialized.
+        """
+        if max_concurrency < 1:
+            raise ValueError(INVALID_MAX_CONCURRENCY)
+        items = enumerate(requests)
+        queue: asyncio.Queue[tuple[int, CurrentConditionsResult] | None] = (
+            asyncio.Queue()
         )
+
+        async def worker() -> None:
+            try:
+                for index, request in items:
+                    try:
+                        result: CurrentConditionsResult = (
+                            await self.async_get_current_conditions(
+                                *request, profile=profile
+                            )
+                        )
+                    except GoogleAirQualityApiError as err:
+                        result = err
+                    queue.put_nowait((index, result))
+            finally:
+                queue.put_nowait(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(max_concurrency)]
+        try:
+            running = len(workers)
+            while running:
+                item = await queue.get()
+                if item is None:
+                    running -= 1
+                    # Surface unexpected errors as soon as a worker dies.
+                    for task in workers:
+                        if task.done() and not task.cancelled():
+                            task.result()
+                    continue
+                yield item
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def async_iter_forecast(
+        self,
+        lat: float,
+        lon: float,
+        period: Period | None = None,
+        *,
+        page_size: int = DEFAULT_FORECAST_PAGE_SIZE,
+        profile: RequestProfile | None = None,
+    ) -> AsyncIterator[AirQualityCurrentConditionsData]:
+        """Yield hourly forecasts for a period, by default the full horizon.
+
+        Pages are requested with pageSize/pageToken and the next page is
+        fetched while the entries of the current one are consumed.
+        """
+        payload = {
+            **_lookup_payload(lat, lon, profile or self._profile),
+            "period": (period or _forecast_period()).as_payload(),
+            "pageSize": page_size,
+        }
+        async for page in self._async_iter_pages(
+            "forecast:lookup", payload, AirQualityForecastData
+        ):
+            for hourly_forecast in page.hourly_forecasts:
+                yield hourly_forecast
+
+    async def async_get_lazy_forecast(
+        self,
+        lat: float,
+        lon: float,
+        period: Period | None = None,
+        *,
+        page_size: int = DEFAULT_FORECAST_PAGE_SIZE,
+        profile: RequestProfile | None = None,
+    ) -> LazyAirQualityForecastData:
+        """Get hourly forecasts for a period, by default the full horizon.
+
+        Hourly records are only deserialized when they are accessed, which
+        keeps reading the first few hours of a long horizon cheap.
+        """
+        payload = {
+            **_lookup_payload(lat, lon, profile or self._profile),
+            "period": (period or _forecast_period()).as_payload(),
+            "pageSize": page_size,
+        }
+        forecast = LazyAirQualityForecastData(LazyHourlyList())
+        async for page in self._async_iter_pages(
+            "forecast:lookup", payload, LazyAirQualityForecastData
+        ):
+            forecast.hourly_forecasts.extend(page.hourly_forecasts)
+            forecast.region_code = forecast.region_code or page.region_code
+        return forecast
+
+    async def async_get_history(  # noqa: PLR0913
+        self,
+        lat: float,
+        lon: float,
+        *,
+        hours: int | None = None,
+        period: Period | None = None,
+        page_size: int = DEFAULT_HISTORY_PAGE_SIZE,
+        profile: RequestProfile | None = None,
+    ) -> AirQualityHistoryData:
+        """Get historical air quality data for the last hours or a period."""
+        payload = {
+            **_lookup_payload(lat, lon, profile or self._profile),
+            "period": _history_period(hours, period).as_payload(),
+            "pageSize": page_size,
+        }
+        history = AirQualityHistoryData()
+        async for page in self._async_iter_pages(
+            "history:lookup", payload, AirQualityHistoryData
+        ):
+            history.hours_info.extend(page.hours_info)
+            history.region_code = history.region_code or page.region_code
+        return history
+
+    async def async_iter_history(  # noqa: PLR0913
+        self,
+        lat: float,
+        lon: float,
+        *,
+        hours: int | None = None,
+        period: Period | None = None,
+        page_size: int = DEFAULT_HISTORY_PAGE_SIZE,
+        prefetch: int = DEFAULT_HISTORY_PREFETCH,
+        profile: RequestProfile | None = None,
+    ) -> AsyncIterator[AirQualityCurrentConditionsData]:
+        """Yield historical hourly records in chronological order.
+
+        The period is split into windows of page_size hours. Up to prefetch
+        windows are requested concurrently ahead of the consumer, so at most
+        prefetch * page_size records are held in memory.
+        """
+        if prefetch < 1:
+            raise ValueError(INVALID_PREFETCH)
+        if page_size < 1:
+            raise ValueError(INVALID_PAGE_SIZE)
+        period = _history_period(hours, period)
+        windows = self._history_windows(period, page_size)
+
+        async def fetch(window: Period) -> list[AirQualityCurrentConditionsData]:
+            payload = {
+                **_lookup_payload(lat, lon, profile or self._profile),
+                "period": window.as_payload(),
+                "pageSize": page_size,
+            }
+            return [
+                hour_info
+                async for page in self._async_iter_pages(
+                    "history:lookup", payload, AirQualityHistoryData
+                )
+                for hour_info in page.hours_info
+            ]
+
+        pending: deque[asyncio.Task[list[AirQualityCurrentConditionsData]]] = deque()
+        try:
+            for window in windows:
+                pending.append(asyncio.create_task(fetch(window)))
+                if len(pending) < prefetch:
+                    continue
+                for hour_info in await pending.popleft():
+                    yield hour_info
+            while pending:
+                for hour_info in await pending.popleft():
+                    yield hour_info
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _history_windows(period: Period, page_size: int) -> Iterator[Period]:
+        """Split a period into consecutive windows of page_size hours."""
+        step = timedelta(hours=page_size)
+        start_time = period.start_time
+        while start_time < period.end_time:
+            end_time = min(start_time + step, period.end_time)
+            yield Period(start_time, end_time)
+            start_time = end_time
+
+    async def _async_iter_pages(
+        self, url: str, payload: dict[str, Any], data_cls: type[_PageT]
+    ) -> AsyncIterator[_PageT]:
+        """Yield the pages of a paginated lookup, one page ahead."""
+        pending: asyncio.Task[_PageT] | None = asyncio.create_task(
+            self._auth.post_json(url, json=payload, data_cls=data_cls)
+        )
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+                if page.next_page_token:
+                    pending = asyncio.create_task(
+                        self._auth.post_json(
+                            url,
+                            json={**payload, "pageToken": page.next_page_token},
+                            data_cls=data_cls,
+                        )
+                    )
+                yield page
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def async_get_heatmap_tile(
+        self, map_type: str, zoom: int, x: int, y: int
+    ) -> memoryview:
+        """Get a heatmap tile as PNG image data.
+
+        Tiles are served from the tile cache, if one is configured.
+        """
+        path = tile_path(map_type, zoom, x, y)
+        if (
+            self._tile_cache is not None
+            and (cached := self._tile_cache.get(path)) is not None
+        ):
+            return cached
+        data = await self._auth.get_bytes(path)
+        if self._tile_cache is not None:
+            await self._tile_cache.async_set(path, data)
+        return memoryview(data)
@@ -4,14 +4,21 @@ Callers subclass this to provide an asyncio implementation that refreshes
 authentication tokens.
 """
 
+import asyncio
 import logging
+import time
+from collections.abc import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from http import HTTPStatus
-from typing import Any, TypeVar
+from importlib.util import find_spec
+from typing import Any, NamedTuple, Self, TypeVar
 
 import aiohttp
-from aiohttp.client_exceptions import ClientError
+from aiohttp.client_exceptions import ClientConnectionError, ClientError
 from mashumaro.mixins.json import DataClassJSONMixin
 
+from .cache import ResponseCache, request_key
 from .const import API_BASE_URL
 from .exceptions import (
     ApiError,
@@ -20,16 +27,60 @@ from .exceptions import (
     InvalidCustomLAQIConfigurationError,
     NoDataForLocationError,
 )
-from .model import Error, ErrorResponse
+from .metrics import STORE, SUCCESS, RequestMetrics, TraceRequestContext, endpoint_label
+from .model import MALFORMED_RESPONSE, Error, ErrorResponse
+from .ratelimit import TokenBucket
+from .retry import RetryPolicy, retry_after
+from .store import SQLiteResponseStore
+from .tracing import (
+    DESERIALIZE_SPAN,
+    ENDPOINT_ATTRIBUTE,
+    METHOD_ATTRIBUTE,
+    NETWORK_SPAN,
+    READ_BODY_SPAN,
+    REQUEST_SPAN,
+    STATUS_ATTRIBUTE,
+    span,
+)
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
 
-MALFORMED_RESPONSE = "Server returned malformed response"
 ERROR_CONNECTING = "Error connecting to API"
 UNSUPPORTED_LAQI_ERROR = "One or more LAQIs are not supported"
 _T = TypeVar("_T", bound=DataClassJSONMixin)
 
+DEFAULT_CONNECTION_LIMIT = 100
+DEFAULT_LIMIT_PER_HOST = 32
+DEFAULT_KEEPALIVE_TIMEOUT = 60.0
+DEFAULT_DNS_CACHE_TTL = 300
+# aiohttp decodes brotli responses only when a brotli package is installed.
+ACCEPT_ENCODING = (
+    "gzip, br" if find_spec("brotli") or find_spec("brotlicffi") else "gzip"
+)
+
+
+class ConnectionStats(NamedTuple):
+    """Connection pool usage of a session."""
+
+    limit: int
+    limit_per_host: int
+    in_use: int
+    idle: int
+
+
+@dataclass
+class _InFlightRequest:
+    """A coalesced request and the number of callers waiting for it."""
+
+    task: asyncio.Task[Any]
+    waiters: int = 0
+
 
 class Auth:
     """Base class for Google Air Quality authentication library.
@@ -37,19 +88,113 @@ class Auth:
     Provides an asyncio interface around the blocking client library.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         websession: aiohttp.ClientSession,
         api_key: str,
         *,
         host: str | None = None,
         referrer: str | None = None,
+        cache: ResponseCache | None = None,
+        coalesce_requests: bool = False,
+        rate_limiter: TokenBucket | None = None,
+        retry_policy: RetryPolicy | None = None,
+        store: SQLiteResponseStore | None = None,
+        metrics: RequestMetrics | None = None,
     ) -> None:
-        """Initialize the auth."""
+        """Initialize the auth.
+
+        With coalesce_requests set, concurrent post_json calls for an
+        identical normalized payload share one underlying request. A
+        rate_limiter is shared by every request made through this object.
+        A retry_policy makes get and post retry transient failures. A
+        persistent store serves post_json responses across restarts.
+        Request timings and sizes are reported to metrics; network timings
+        require a session created with metrics.trace_config().
+        """
         self._websession = websession
         self._host = host or API_BASE_URL
         self.api_key = api_key
         self.referrer = referrer
+        self._cache = cache
+        self._coalesce_requests = coalesce_requests
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+        self._store = store
+        self._metrics = metrics
+        self._in_flight: dict[Hashable, _InFlightRequest] = {}
+
+    @classmethod
+    @asynccontextmanager
+    async def create(  # noqa: PLR0913
+        cls,
+        api_key: str,
+        *,
+        limit: int = DEFAULT_CONNECTION_LIMIT,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int = DEFAULT_DNS_CACHE_TTL,
+        warm_up: int = 0,
+        **kwargs: Any,
+    ) -> AsyncIterator[Self]:
+        """Create an Auth with its own session tuned for the API host.
+
+        Connections are kept alive for keepalive_timeout seconds, DNS lookups
+        are cached and responses are requested compressed. With warm_up set,
+        that many connections are opened before the Auth is returned. Other
+        keyword arguments are passed to Auth; with metrics set, the session
+        is traced by them. The session is closed on exit.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=dns_cache_ttl,
+        )
+        trace_configs = []
+        if (metrics := kwargs.get("metrics")) is not None:
+            trace_configs.append(metrics.trace_config())
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            trace_configs=trace_configs,
+        ) as session:
+            auth = cls(session, api_key, **kwargs)
+            if warm_up:
+                await auth.async_warm_up(warm_up)
+            yield auth
+
+    async def async_warm_up(self, connections: int) -> None:
+        """Open connections to the API host ahead of the first requests.
+
+        Each connection makes an unauthenticated GET of the API base url, so
+        the TLS handshake is done and the connection is kept in the pool.
+        Failures are logged and otherwise ignored.
+        """
+
+        async def connect() -> None:
+            try:
+                async with self._websession.get(self._host) as resp:
+                    await resp.read()
+            except aiohttp.ClientError as err:
+                _LOGGER.debug("Warming up connection to %s failed: %s", self._host, err)
+
+        await asyncio.gather(*(connect() for _ in range(connections)))
+
+    def connection_stats(self) -> ConnectionStats:
+        """Return the connection pool usage of the session."""
+        connector = self._websession.connector
+        if connector is None:
+            return ConnectionStats(0, 0, 0, 0)
+        # aiohttp has no public accessors for the pool contents.
+        acquired = getattr(connector, "_acquired", ())
+        idle = getattr(connector, "_conns", {})
+        return ConnectionStats(
+            limit=connector.limit,
+            limit_per_host=connector.limit_per_host,
+            in_use=len(acquired),
+            idle=sum(len(conns) for conns in idle.values()),
+        )
 
     async def request(
         self,
@@ -63,6 +208,8 @@ class Auth:
             headers = {}
         if self.referrer:
             headers["Referer"] = self.referrer
+        if self._metrics is not None:
+            kwargs["trace_request_ctx"] = TraceRequestContext(endpoint_label(url))
         if not url.startswith(("http://", "https://")):
             url = f"{self._host}/{url}"
         _LOGGER.debug("request[%s]=%s %s", method, url, kwargs)
@@ -70,13 +217,68 @@ class Auth:
             _LOGGER.debug("request[post json]=%s", kwargs["json"])
         sep = "&" if "?" in url else "?"
         url = f"{url}{sep}key={self.api_key}"
+        with span(REQUEST_SPAN) as request_span:
+            if request_span.is_recording():
+                request_span.set_attribute(ENDPOINT_ATTRIBUTE, endpoint_label(url))
+                request_span.set_attribute(METHOD_ATTRIBUTE, method.upper())
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire()
+            with span(NETWORK_SPAN, client=True):
+                resp = await self._websession.request(
+                    method, url, **kwargs, headers=headers
+                )
+            if request_span.is_recording():
+                request_span.set_attribute(STATUS_ATTRIBUTE, resp.status)
+            return resp
 
-        return await self._websession.request(method, url, **kwargs, headers=headers)
+    async def _request_with_retry(
+        self, method: str, url: str, **kwargs: Any
+    ) -> aiohttp.ClientResponse:
+        """Make a request, retrying transient failures per the retry policy.
+
+        Once retries are exhausted, the last response is returned or the
+        last connection error is raised.
+        """
+        policy = self._retry_policy
+        if policy is None:
+            return await self.request(method, url, **kwargs)
+        policy.stats.requests += 1
+        deadline = None
+        if policy.deadline is not None:
+            deadline = time.monotonic() + policy.deadline
+        delay = policy.base_delay
+        attempt = 1
+        while True:
+            policy.stats.attempts += 1
+            outcome: aiohttp.ClientResponse | ClientConnectionError
+            try:
+                outcome = await self.request(method, url, **kwargs)
+            except ClientConnectionError as err:
+                outcome = err
+            requested_delay = None
+            if isinstance(outcome, aiohttp.ClientResponse):
+                if outcome.status not in policy.retry_statuses:
+                    return outcome
+                requested_delay = retry_after(outcome)
+            delay = policy.next_delay(delay, requested_delay)
+            if attempt >= policy.max_attempts or (
+                deadline is not None and time.monotonic() + delay > deadline
+            ):
+                policy.stats.exhausted += 1
+                if isinstance(outcome, ClientConnectionError):
+                    raise outcome
+                return outcome
+            if isinstance(outcome, aiohttp.ClientResponse):
+                outcome.release()
+            policy.stats.retries += 1
+            attempt += 1
+            _LOGGER.debug("retrying request[%s]=%s in %.2fs", method, url, delay)
+            await asyncio.sleep(delay)
 
     async def get(self, url: str, **kwargs: Any) -> aiohttp.ClientResponse:
         """Make a get request."""
         try:
-            resp = await self.request("get", url, **kwargs)
+            resp = await self._request_with_retry("get", url, **kwargs)
         except ClientError as err:
             raise ApiError(err) from err
         return await Auth._raise_for_status(resp)
@@ -89,41 +291,145 @@ class Auth:
     ) -> _T:
         """Make a get request and return json response."""
         resp = await self.get(url, **kwargs)
+        return self._parse_body(await self._read_body(resp, url), data_cls, url)
+
+    async def get_bytes(self, url: str, **kwargs: Any) -> bytes:
+        """Make a get request and return the raw response body."""
+        resp = await self.get(url, **kwargs)
+        start = time.perf_counter() if self._metrics is not None else 0.0
         try:
-            result = await resp.text()
+            result = await resp.read()
         except ClientError as err:
             message = f"{ERROR_CONNECTING}: {err}"
             raise ApiError(message) from err
-        _LOGGER.debug("response=%s", result)
-        try:
-            return data_cls.from_json(result)
-        except (LookupError, ValueError) as err:
-            message = f"{MALFORMED_RESPONSE}: {err}"
-            raise ApiError(message) from err
+        if self._metrics is not None:
+            Auth._observe_read(self._metrics, url, start, result)
+        return result
 
     async def post(self, url: str, **kwargs: Any) -> aiohttp.ClientResponse:
         """Make a post request."""
         try:
-            resp = await self.request("post", url, **kwargs)
+            resp = await self._request_with_retry("post", url, **kwargs)
         except ClientError as err:
             message = f"{ERROR_CONNECTING}: {err}"
             raise ApiError(message) from err
         return await Auth._raise_for_status(resp)
 
     async def post_json(self, url: str, data_cls: type[_T], **kwargs: Any) -> _T:
-        """Make a post request and return a json response."""
-        resp = await self.post(url, **kwargs)
+        """Make a post request and return a json response.
+
+        Responses are served from and stored in the response cache and the
+        persistent store, if configured and the request has a json payload.
+        """
+        if "json" not in kwargs:
+            return await self._post_json(url, data_cls, None, **kwargs)
+        payload = kwargs["json"]
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._cache.key(url, data_cls, payload)
+            if (cached := self._cache.get(cache_key)) is not None:
+                return cached
+        if not self._coalesce_requests:
+            return await self._post_json(url, data_cls, cache_key, **kwargs)
+
+        key = request_key(url, data_cls, payload)
+        if (request := self._in_flight.get(key)) is None:
+            task = asyncio.create_task(
+                self._post_json(url, data_cls, cache_key, **kwargs)
+            )
+            request = self._in_flight[key] = _InFlightRequest(task)
+            task.add_done_callback(lambda done: self._request_done(key, done))
+        request.waiters += 1
         try:
-            result = await resp.text()
+            # Shielded so that one cancelled caller does not cancel the others.
+            return await asyncio.shield(request.task)
+        finally:
+            request.waiters -= 1
+            if not request.waiters and not request.task.done():
+                # Every caller was cancelled, nobody needs the response.
+                self._forget_request(key, request.task)
+                request.task.cancel()
+
+    async def _post_json(
+        self, url: str, data_cls: type[_T], cache_key: Hashable | None, **kwargs: Any
+    ) -> _T:
+        """Make a post request, parse and cache the json response."""
+        store_key = body = None
+        if self._store is not None and "json" in kwargs:
+            store_key = self._store.key(url, data_cls, kwargs["json"])
+            body = await self._store.async_get(store_key)
+        if body is None:
+            resp = await self.post(url, **kwargs)
+            body = await self._read_body(resp, url)
+            result = self._parse_body(body, data_cls, url)
+            if self._store is not None and store_key is not None:
+                await self._store.async_set(url, store_key, body, result)
+        else:
+            result = self._parse_body(body, data_cls, url, STORE)
+        if self._cache is not None and cache_key is not None:
+            self._cache.set(url, cache_key, result, len(body))
+        return result
+
+    def _request_done(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Forget a finished coalesced request."""
+        self._forget_request(key, task)
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller went away.
+            task.exception()
+
+    def _forget_request(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Stop sharing a coalesced request with new callers."""
+        if (request := self._in_flight.get(key)) is not None and request.task is task:
+            del self._in_flight[key]
+
+    async def _read_body(self, resp: aiohttp.ClientResponse, url: str) -> bytes:
+        """Read the raw response body."""
+        start = time.perf_counter() if self._metrics is not None else 0.0
+        try:
+            with span(READ_BODY_SPAN):
+                result = await resp.read()
         except ClientError as err:
             message = f"{ERROR_CONNECTING}: {err}"
             raise ApiError(message) from err
-        _LOGGER.debug("response=%s", result)
+        if self._metrics is not None:
+            Auth._observe_read(self._metrics, url, start, result)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("response=%s", result.decode(errors="replace"))
+        return result
+
+    def _parse_body(
+        self, body: bytes, data_cls: type[_T], url: str, outcome: str = SUCCESS
+    ) -> _T:
+        """Deserialize a json response body.
+
+        The body is parsed with orjson when it is installed.
+        """
         try:
-            return data_cls.from_json(result)
+            with span(DESERIALIZE_SPAN):
+                if self._metrics is None:
+                    return data_cls.from_dict(json_loads(body))
+                start = time.perf_counter()
+                data = json_loads(body)
+                parsed = time.perf_counter()
+                result = data_cls.from_dict(data)
         except (LookupError, ValueError) as err:
             message = f"{MALFORMED_RESPONSE}: {err}"
             raise ApiError(message) from err
+        endpoint = endpoint_label(url)
+        self._metrics.observe("parse_seconds", endpoint, outcome, parsed - start)
+        self._metrics.observe(
+            "deserialize_seconds", endpoint, outcome, time.perf_counter() - parsed
+        )
+        return result
+
+    @staticmethod
+    def _observe_read(
+        metrics: RequestMetrics, url: str, start: float, body: bytes
+    ) -> None:
+        """Report the time reading a response body and its size."""
+        endpoint = endpoint_label(url)
+        metrics.observe("read_seconds", endpoint, SUCCESS, time.perf_counter() - start)
+        metrics.observe("response_bytes", endpoint, SUCCESS, len(body))
 
     @classmethod
     async def _raise_for_status(
@@ -163,11 +469,11 @@ class Auth:
         if resp.status < 400:
             return None
         try:
-            result = await resp.text()
+            result = await resp.read()
         except ClientError:
             return None
         try:
-            error_response = ErrorResponse.from_json(result)
+            error_response = ErrorResponse.from_dict(json_loads(result))
         except (LookupError, ValueError):
             return None
         return error_response.error
@@ -0,0 +1,186 @@
+"""In-memory response cache for Google Air Quality API lookups."""
+
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from . import geohash
+
+SECONDS_PER_HOUR = 3600
+COORDINATE_PRECISION = 6
+
+DEFAULT_TTLS: Mapping[str, float] = {
+    "currentConditions:lookup": SECONDS_PER_HOUR,
+    "forecast:lookup": SECONDS_PER_HOUR,
+}
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def normalize_payload(payload: Mapping[str, Any]) -> str:
+    """Return a canonical string for a lookup request payload.
+
+    Coordinates are rounded, list options are sorted and a requested
+    dateTime is truncated to the hour the API reports data for, so
+    equivalent requests map onto the same string.
+    """
+    normalized = dict(payload)
+    if location := normalized.get("location"):
+        normalized["location"] = {
+            key: round(value, COORDINATE_PRECISION)
+            if isinstance(value, int | float)
+            else value
+            for key, value in location.items()
+        }
+    if extra_computations := normalized.get("extraComputations"):
+        normalized["extraComputations"] = sorted(extra_computations)
+    if custom_local_aqis := normalized.get("customLocalAqis"):
+        normalized["customLocalAqis"] = sorted(
+            custom_local_aqis, key=lambda aqi: (aqi["regionCode"], aqi["aqi"])
+        )
+    if date_time := normalized.get("dateTime"):
+        normalized["dateTime"] = (
+            datetime.fromisoformat(date_time)
+            .replace(minute=0, second=0, microsecond=0)
+            .isoformat()
+        )
+    return json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+
+
+def request_key(url: str, data_cls: type, payload: Mapping[str, Any]) -> Hashable:
+    """Return a key identifying equivalent requests."""
+    return (url, data_cls.__qualname__, normalize_payload(payload))
+
+
+@dataclass
+class CacheStats:
+    """Counters for cache lookups."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the share of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _CacheEntry(NamedTuple):
+    """A cached value with its accounted size and expiry time."""
+
+    value: Any
+    size: int
+    expires_at: float
+
+
+class ResponseCache:
+    """TTL cache of deserialized responses with LRU eviction.
+
+    Entries are bounded by count and, optionally, by the total size of the
+    response bodies they were parsed from. With a geohash_precision, request
+    locations are quantized to geohash cells, so a lookup near a cached
+    location is served from the cache.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        ttls: Mapping[str, float] | None = None,
+        default_ttl: float = SECONDS_PER_HOUR,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int | None = None,
+        align_to_hour: bool = True,
+        geohash_precision: int | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the cache.
+
+        With align_to_hour set, entries also expire at the next full hour,
+        which is when the API publishes new data.
+        """
+        self._ttls = DEFAULT_TTLS if ttls is None else ttls
+        self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._align_to_hour = align_to_hour
+        if geohash_precision is not None and not (
+            1 <= geohash_precision <= geohash.MAX_PRECISION
+        ):
+            raise ValueError(geohash.INVALID_PRECISION)
+        self._geohash_precision = geohash_precision
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._size = 0
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    @property
+    def geohash_precision(self) -> int | None:
+        """Return the geohash precision locations are quantized to, if any."""
+        return self._geohash_precision
+
+    @property
+    def size_bytes(self) -> int:
+        """Return the accounted size of all cached entries."""
+        return self._size
+
+    def key(self, url: str, data_cls: type, payload: Mapping[str, Any]) -> Hashable:
+        """Return the cache key for a request."""
+        if self._geohash_precision is not None and (
+            location := payload.get("location")
+        ):
+            cell = geohash.encode(
+                location["latitude"], location["longitude"], self._geohash_precision
+            )
+            payload = {**payload, "location": {"geohash": cell}}
+        return request_key(url, data_cls, payload)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return a fresh cached value, or None."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self._clock():
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.value
+
+    def set(self, url: str, key: Hashable, value: Any, size: int) -> None:
+        """Store a value for a request made to the url endpoint."""
+        ttl = self._ttls.get(url, self._default_ttl)
+        if ttl <= 0 or (self._max_bytes is not None and size > self._max_bytes):
+            return
+        now = self._clock()
+        expires_at = now + ttl
+        if self._align_to_hour:
+            next_hour = (now // SECONDS_PER_HOUR + 1) * SECONDS_PER_HOUR
+            expires_at = min(expires_at, next_hour)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _CacheEntry(value, size, expires_at)
+        self._size += size
+        while len(self._entries) > self._max_entries or (
+            self._max_bytes is not None and self._size > self._max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._size = 0
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry and release its size."""
+        self._size -= self._entries.pop(key).size
@@ -0,0 +1,331 @@
+"""Command line interface for bulk Google Air Quality API lookups.
+
+Usage: google-air-quality bulk LOCATIONS [--format ndjson|csv] [--workers N]
+
+LOCATIONS is a CSV file of lat,lon[,region_code,custom_local_aqi] rows.
+Lines starting with # and a header row are skipped, other rows that are
+not a location are reported as errors. The file is split across worker
+processes, each with its own event loop, session and concurrency cap, so
+responses are deserialized on several cores. Results are written as they
+complete, tagged with the index of their location.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import sys
+from collections.abc import Iterator, Sequence
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import IO, Any, NamedTuple
+
+from .api import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PROFILE,
+    LEAN_PROFILE,
+    CurrentConditionsRequest,
+    CurrentConditionsResult,
+    GoogleAirQualityApi,
+)
+from .auth import Auth
+from .exceptions import GoogleAirQualityApiError
+from .pollutants import POLLUTANT_CODE_MAPPING
+
+API_KEY_ENV = "GOOGLE_AIR_QUALITY_API_KEY"
+MISSING_API_KEY = f"an API key is required, pass --api-key or set {API_KEY_ENV}"
+INVALID_LOCATION = "Invalid location"
+# Rows are sent from the workers in batches to keep the IPC overhead low.
+RESULT_BATCH_SIZE = 50
+# How often to check for workers that died without reporting, in seconds.
+WORKER_POLL_INTERVAL = 1.0
+CSV_POLLUTANTS = POLLUTANT_CODE_MAPPING["uaqi"]
+CSV_FIELDS = [
+    "index",
+    "lat",
+    "lon",
+    "date_time",
+    "region_code",
+    "uaqi",
+    "uaqi_category",
+    "laqi_code",
+    "laqi",
+    "laqi_category",
+    *CSV_POLLUTANTS,
+    "error",
+]
+
+
+class BulkOptions(NamedTuple):
+    """Options shared by the worker processes."""
+
+    locations: Path
+    api_key: str
+    host: str | None
+    workers: int
+    concurrency: int
+    lean: bool
+
+
+def _optional_column(row: list[str], column: int) -> str | None:
+    """Return the value of an optional column, or None if it is empty."""
+    return (row[column].strip() or None) if len(row) > column else None
+
+
+def read_locations(
+    path: Path, shard: int = 0, shards: int = 1
+) -> Iterator[tuple[int, CurrentConditionsRequest | str]]:
+    """Yield (index, request) for every shards-th location of a file.
+
+    Rows that are not a location are yielded with an error message instead
+    of a request.
+    """
+    index = 0
+    with path.open(newline="", encoding="utf-8") as file:
+        for row in csv.reader(file):
+            if not row or row[0].lstrip().startswith("#"):
+                continue
+            location: CurrentConditionsRequest | str
+            try:
+                lat, lon = float(row[0]), float(row[1])
+            except ValueError:
+                if index == 0:
+                    continue  # Header row
+                location = f"{INVALID_LOCATION}: {','.join(row)}"
+            except IndexError:
+                location = f"{INVALID_LOCATION}: {','.join(row)}"
+            else:
+                location = CurrentConditionsRequest(
+                    lat,
+                    lon,
+                    region_code=_optional_column(row, 2),
+                    custom_local_aqi=_optional_column(row, 3),
+                )
+            if index % shards == shard:
+                yield index, location
+            index += 1
+
+
+def result_row(
+    index: int, request: CurrentConditionsRequest, result: CurrentConditionsResult
+) -> dict[str, Any]:
+    """Return the output row of a lookup."""
+    row: dict[str, Any] = {"index": index, "lat": request.lat, "lon": request.lon}
+    if isinstance(result, GoogleAirQualityApiError):
+        row["error"] = str(result)
+        return row
+    uaqi, laqi = result.indexes.uaqi, result.indexes.laqi
+    row |= {
+        "date_time": result.date_time.isoformat(),
+        "region_code": result.region_code,
+        "uaqi": None if uaqi is None else uaqi.aqi,
+        "uaqi_category": None if uaqi is None else uaqi.category,
+        "laqi_code": None if laqi is None else laqi.code,
+        "laqi": None if laqi is None else laqi.aqi,
+        "laqi_category": None if laqi is None else laqi.category,
+        "pollutants": {
+            pollutant.code: pollutant.concentration.value
+            for pollutant in result.pollutants
+        },
+    }
+    return row
+
+
+async def _async_run_shard(
+    options: BulkOptions, shard: int, results: multiprocessing.Queue
+) -> None:
+    """Look up the locations of a shard and send the rows to results."""
+    # Locations read but not yet answered, by position in the shard.
+    pending: dict[int, tuple[int, CurrentConditionsRequest]] = {}
+    batch: list[dict[str, Any]] = []
+
+    def requests() -> Iterator[CurrentConditionsRequest]:
+        positions = itertools.count()
+        for index, location in read_locations(
+            options.locations, shard, options.workers
+        ):
+            if isinstance(location, str):
+                batch.append({"index": index, "error": location})
+                continue
+            pending[next(positions)] = (index, location)
+            yield location
+
+    profile = LEAN_PROFILE if options.lean else DEFAULT_PROFILE
+    async with Auth.create(
+        options.api_key, host=options.host, limit_per_host=options.concurrency
+    ) as auth:
+        api = GoogleAirQualityApi(auth, profile=profile)
+        async for position, result in api.async_iter_current_conditions(
+            requests(), max_concurrency=options.concurrency
+        ):
+            index, request = pending.pop(position)
+            batch.append(result_row(index, request, result))
+            if len(batch) >= RESULT_BATCH_SIZE:
+                results.put(batch)
+                batch = []
+        if batch:
+            results.put(batch)
+
+
+def run_shard(options: BulkOptions, shard: int, results: multiprocessing.Queue) -> None:
+    """Run a shard in a worker process and report when it is done."""
+    try:
+        asyncio.run(_async_run_shard(options, shard, results))
+    except Exception as err:  # noqa: BLE001
+        results.put(("error", shard, repr(err)))
+    else:
+        results.put(("done", shard, None))
+
+
+class _Writer:
+    """Writes rows as NDJSON or CSV."""
+
+    def __init__(self, output: IO[str], output_format: str) -> None:
+        """Initialize the writer."""
+        self._output = output
+        self._csv = None
+        if output_format == "csv":
+            self._csv = csv.DictWriter(output, CSV_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        """Write rows and flush them."""
+        for row in rows:
+            if self._csv is None:
+                self._output.write(json.dumps(row) + "\n")
+            else:
+                pollutants = row.pop("pollutants", {})
+                self._csv.writerow({**row, **pollutants})
+        self._output.flush()
+
+
+class _Collector:
+    """Writes the rows sent by the workers and tracks which are running."""
+
+    def __init__(
+        self,
+        workers: Sequence[BaseProcess],
+        results: multiprocessing.Queue,
+        writer: _Writer,
+    ) -> None:
+        """Initialize the collector."""
+        self._running = dict(enumerate(workers))
+        self._results = results
+        self._writer = writer
+        self.failed = 0
+
+    def run(self) -> int:
+        """Collect results until every worker is done and return the failures.
+
+        Workers that die without reporting, e.g. when killed, count as failed.
+        """
+        while self._running:
+            try:
+                self._handle(self._results.get(timeout=WORKER_POLL_INTERVAL))
+            except queue.Empty:
+                self._reap()
+        return self.failed
+
+    def _handle(self, item: Any) -> None:
+        """Write a batch of rows or record the status of a worker."""
+        if isinstance(item, list):
+            self._writer.write(item)
+            return
+        status, shard, message = item
+        del self._running[shard]
+        if status == "error":
+            self._fail(shard, f"failed: {message}")
+
+    def _reap(self) -> None:
+        """Count workers that exited without reporting as failed."""
+        dead = [shard for shard, w in self._running.items() if w.exitcode is not None]
+        if not dead:
+            return
+        # Everything a dead worker sent is in the queue by now.
+        with contextlib.suppress(queue.Empty):
+            while True:
+                self._handle(self._results.get(timeout=0.1))
+        for shard in dead:
+            if (worker := self._running.pop(shard, None)) is not None:
+                self._fail(shard, f"exited with code {worker.exitcode}")
+
+    def _fail(self, shard: int, reason: str) -> None:
+        """Report a failed worker."""
+        self.failed += 1
+        sys.stderr.write(f"worker {shard} {reason}\n")
+
+
+def bulk(options: BulkOptions, output: IO[str], output_format: str) -> int:
+    """Run a bulk lookup and return the number of failed workers."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    workers = [
+        context.Process(target=run_shard, args=(options, shard, results))
+        for shard in range(options.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    failed = _Collector(workers, results, _Writer(output, output_format)).run()
+    for worker in workers:
+        worker.join()
+    return failed
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Return the argument parser."""
+    parser = argparse.ArgumentParser(prog="google-air-quality")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bulk_parser = commands.add_parser(
+        "bulk", help="look up current conditions for a file of locations"
+    )
+    bulk_parser.add_argument("locations", type=Path, help="CSV file of locations")
+    bulk_parser.add_argument(
+        "--output", type=Path, help="file to write, default standard output"
+    )
+    bulk_parser.add_argument(
+        "--format", choices=("ndjson", "csv"), default="ndjson", dest="output_format"
+    )
+    bulk_parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="worker processes"
+    )
+    bulk_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help="concurrent requests per worker",
+    )
+    bulk_parser.add_argument(
+        "--lean", action="store_true", help="only request the universal AQI"
+    )
+    bulk_parser.add_argument("--api-key", help=f"API key, default ${API_KEY_ENV}")
+    bulk_parser.add_argument("--host", help="API base url, e.g. of an emulator")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command line interface."""
+    parser = _parser()
+    args = parser.parse_args(argv)
+    api_key = args.api_key or os.environ.get(API_KEY_ENV)
+    if not api_key:
+        parser.error(MISSING_API_KEY)
+    if args.workers < 1 or args.concurrency < 1:
+        parser.error("--workers and --concurrency must be at least 1")
+    options = BulkOptions(
+        args.locations, api_key, args.host, args.workers, args.concurrency, args.lean
+    )
+    if args.output is None:
+        failed = bulk(options, sys.stdout, args.output_format)
+    else:
+        with args.output.open("w", newline="", encoding="utf-8") as output:
+            failed = bulk(options, output, args.output_format)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
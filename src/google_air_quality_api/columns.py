@@ -0,0 +1,89 @@
+"""Column-oriented view of hourly air quality records."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .model import AirQualityCurrentConditionsData
+
+NUMPY_REQUIRED = "numpy is required for to_numpy()"
+
+
+def _column(length: int) -> array[float]:
+    """Return a new column holding length missing values."""
+    return array("d", [math.nan]) * length
+
+
+def _set_cell(values: array[float], row: int, value: float) -> None:
+    """Set the cell of a row, the last value wins if a code repeats."""
+    if len(values) > row:
+        values[row] = value
+    else:
+        values.append(value)
+
+
+@dataclass
+class AirQualityColumns:
+    """Hourly records as one contiguous array per value.
+
+    Timestamps are POSIX seconds. Values missing from an hour are NaN.
+    """
+
+    timestamps: array[float] = field(default_factory=lambda: array("d"))
+    concentrations: dict[str, array[float]] = field(default_factory=dict)
+    units: dict[str, str] = field(default_factory=dict)
+    aqi: dict[str, array[float]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        """Return the number of hours."""
+        return len(self.timestamps)
+
+    @classmethod
+    def from_hours(
+        cls, hours: Iterable[AirQualityCurrentConditionsData]
+    ) -> AirQualityColumns:
+        """Build columns from hourly records in a single pass."""
+        columns = cls()
+        timestamps = columns.timestamps
+        concentrations = columns.concentrations
+        aqi = columns.aqi
+        for hour in hours:
+            row = len(timestamps)
+            timestamps.append(hour.date_time.timestamp())
+            for pollutant in hour._pollutants:  # noqa: SLF001
+                code = pollutant.code.lower()
+                if (values := concentrations.get(code)) is None:
+                    values = concentrations[code] = _column(row)
+                    columns.units[code] = pollutant.concentration.units
+                _set_cell(values, row, pollutant.concentration.value)
+            for index in hour._indexes:  # noqa: SLF001
+                if (values := aqi.get(index.code)) is None:
+                    values = aqi[index.code] = _column(row)
+                _set_cell(values, row, math.nan if index.aqi is None else index.aqi)
+            for values in (*concentrations.values(), *aqi.values()):
+                if len(values) <= row:
+                    values.append(math.nan)
+        return columns
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Return the columns as NumPy arrays sharing the same memory.
+
+        Keys are "timestamp", "concentration_<pollutant>" and "aqi_<index>",
+        which can be passed directly to a pandas DataFrame.
+        """
+        try:
+            import numpy as np  # noqa: PLC0415  # ty: ignore[unresolved-import]
+        except ImportError as err:
+            raise ImportError(NUMPY_REQUIRED) from err
+        result = {"timestamp": np.frombuffer(self.timestamps, dtype=np.float64)}
+        for code, values in self.concentrations.items():
+            result[f"concentration_{code}"] = np.frombuffer(values, dtype=np.float64)
+        for code, values in self.aqi.items():
+            result[f"aqi_{code}"] = np.frombuffer(values, dtype=np.float64)
+        return result
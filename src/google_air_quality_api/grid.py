@@ -0,0 +1,166 @@
+"""Sample air quality on a regular latitude/longitude grid."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .api import DEFAULT_MAX_CONCURRENCY, CurrentConditionsRequest, RequestProfile
+from .columns import NUMPY_REQUIRED
+from .exceptions import NoDataForLocationError
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .api import GoogleAirQualityApi
+    from .model import AirQualityCurrentConditionsData
+
+# The API reports conditions at a resolution of about 500 x 500 meters.
+API_RESOLUTION_DEGREES = 0.005
+INVALID_SPACING = "spacing must be positive"
+INVALID_BOUNDING_BOX = "south must not exceed north and west must not exceed east"
+
+
+class BoundingBox(NamedTuple):
+    """A latitude/longitude rectangle."""
+
+    south: float
+    west: float
+    north: float
+    east: float
+
+
+def _axis(start: float, end: float, spacing: float) -> array[float]:
+    """Return evenly spaced coordinates from start up to end."""
+    count = math.floor((end - start) / spacing + 1e-9) + 1
+    return array("d", (start + step * spacing for step in range(count)))
+
+
+def _snap(value: float, resolution: float) -> float:
+    """Snap a coordinate to the API resolution."""
+    return round(round(value / resolution) * resolution, 6)
+
+
+def _grid(rows: int, cols: int) -> list[array[float]]:
+    """Return a grid of missing values."""
+    return [array("d", [math.nan]) * cols for _ in range(rows)]
+
+
+@dataclass
+class AirQualityGrid:
+    """Air quality values on a grid, one row per latitude.
+
+    Cells without data are NaN and flagged in mask.
+    """
+
+    latitudes: array[float]
+    longitudes: array[float]
+    uaqi: list[array[float]]
+    laqi: list[array[float]]
+    concentrations: dict[str, list[array[float]]] = field(default_factory=dict)
+    mask: list[list[bool]] = field(default_factory=list)
+    requests: int = 0
+
+    def _set(self, row: int, col: int, data: AirQualityCurrentConditionsData) -> None:
+        """Fill a cell from a lookup result."""
+        self.mask[row][col] = False
+        indexes = data.indexes
+        if indexes.uaqi is not None and indexes.uaqi.aqi is not None:
+            self.uaqi[row][col] = indexes.uaqi.aqi
+        if indexes.laqi is not None and indexes.laqi.aqi is not None:
+            self.laqi[row][col] = indexes.laqi.aqi
+        for pollutant in data.pollutants:
+            code = pollutant.code.lower()
+            if (values := self.concentrations.get(code)) is None:
+                values = self.concentrations[code] = _grid(
+                    len(self.latitudes), len(self.longitudes)
+                )
+            values[row][col] = pollutant.concentration.value
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Return the grids as NumPy masked arrays.
+
+        Keys are "uaqi", "laqi" and "concentration_<pollutant>".
+        """
+        try:
+            import numpy as np  # noqa: PLC0415  # ty: ignore[unresolved-import]
+        except ImportError as err:
+            raise ImportError(NUMPY_REQUIRED) from err
+        mask = np.array(self.mask, dtype=bool)
+        grids = {"uaqi": self.uaqi, "laqi": self.laqi} | {
+            f"concentration_{code}": values
+            for code, values in self.concentrations.items()
+        }
+        return {
+            name: np.ma.masked_array(np.array(values, dtype=np.float64), mask=mask)
+            for name, values in grids.items()
+        }
+
+
+async def async_sample_grid(  # noqa: PLR0913
+    api: GoogleAirQualityApi,
+    bounding_box: BoundingBox,
+    spacing: float,
+    *,
+    region_code: str | None = None,
+    custom_local_aqi: str | None = None,
+    custom_local_aqis: Mapping[str, str] | None = None,
+    resolution: float = API_RESOLUTION_DEGREES,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    profile: RequestProfile | None = None,
+) -> AirQualityGrid:
+    """Fetch current conditions for every point of a grid.
+
+    Points are spacing degrees apart. Each point is snapped to the API
+    resolution and points snapping to the same location are fetched once.
+    Locations without data are masked; any other error is raised. Pass
+    LEAN_PROFILE as profile when only the universal AQI is needed.
+    """
+    if spacing <= 0:
+        raise ValueError(INVALID_SPACING)
+    south, west, north, east = bounding_box
+    if south > north or west > east:
+        raise ValueError(INVALID_BOUNDING_BOX)
+    latitudes = _axis(south, north, spacing)
+    longitudes = _axis(west, east, spacing)
+
+    cells = [
+        [(_snap(lat, resolution), _snap(lon, resolution)) for lon in longitudes]
+        for lat in latitudes
+    ]
+    locations = list(dict.fromkeys(cell for row in cells for cell in row))
+    results = await api.async_get_current_conditions_batch(
+        (
+            CurrentConditionsRequest(
+                lat, lon, region_code, custom_local_aqi, custom_local_aqis
+            )
+            for lat, lon in locations
+        ),
+        max_concurrency=max_concurrency,
+        profile=profile,
+    )
+    by_location: dict[tuple[float, float], AirQualityCurrentConditionsData | None] = {}
+    for location, result in zip(locations, results, strict=True):
+        if isinstance(result, NoDataForLocationError):
+            by_location[location] = None
+        elif isinstance(result, Exception):
+            raise result
+        else:
+            by_location[location] = result
+
+    rows, cols = len(latitudes), len(longitudes)
+    grid = AirQualityGrid(
+        latitudes,
+        longitudes,
+        uaqi=_grid(rows, cols),
+        laqi=_grid(rows, cols),
+        mask=[[True] * cols for _ in range(rows)],
+        requests=len(locations),
+    )
+    for row, row_cells in enumerate(cells):
+        for col, location in enumerate(row_cells):
+            if (data := by_location[location]) is not None:
+                grid._set(row, col, data)  # noqa: SLF001
+    return grid
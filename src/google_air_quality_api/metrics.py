@@ -0,0 +1,278 @@
+"""Latency and payload size metrics of Google Air Quality API requests."""
+
+import bisect
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from types import SimpleNamespace
+from typing import NamedTuple
+
+import aiohttp
+
+PREFIX = "google_air_quality"
+SECONDS_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# aiohttp reports the TLS handshake as part of creating the connection, so
+# it is included in connect_seconds.
+METRICS = {
+    "duration_seconds": "Time from starting a request to its response headers",
+    "dns_seconds": "Time resolving the API host",
+    "connect_seconds": "Time opening a connection, including the TLS handshake",
+    "ttfb_seconds": "Time from sending a request to its response headers",
+    "read_seconds": "Time reading a response body",
+    "parse_seconds": "Time parsing a response body as JSON",
+    "deserialize_seconds": "Time deserializing parsed JSON into data classes",
+    "request_bytes": "Size of a request body",
+    "response_bytes": "Size of a response body",
+}
+
+SUCCESS = "success"
+STORE = "store"
+CONNECTION_ERROR = "connection_error"
+OTHER_ENDPOINT = "other"
+
+
+class Observation(NamedTuple):
+    """A single measurement of a request."""
+
+    name: str
+    endpoint: str
+    outcome: str
+    value: float
+
+
+MetricsCallback = Callable[[Observation], None]
+
+
+class TraceRequestContext(NamedTuple):
+    """Labels passed to the trace callbacks of a request."""
+
+    endpoint: str
+
+
+def endpoint_label(url: str) -> str:
+    """Return the endpoint of a request url, without host and parameters.
+
+    Heatmap tiles share one label regardless of the tile coordinates.
+    """
+    path = url.split("?", 1)[0]
+    if "/heatmapTiles/" in path:
+        return "heatmapTiles"
+    return path.rsplit("/", 1)[-1]
+
+
+def outcome_class(status: int) -> str:
+    """Return the outcome class of a response status."""
+    if status < HTTPStatus.BAD_REQUEST:
+        return SUCCESS
+    if status == HTTPStatus.TOO_MANY_REQUESTS:
+        return "throttled"
+    if status < HTTPStatus.INTERNAL_SERVER_ERROR:
+        return "client_error"
+    return "server_error"
+
+
+@dataclass
+class Histogram:
+    """Counts of observed values per bucket upper bound."""
+
+    buckets: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    sum: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        """Initialize the bucket counts."""
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        """Add a value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _format_float(value: float) -> str:
+    """Format a number as Prometheus does."""
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MetricsRegistry:
+    """Histograms of observations, labelled by endpoint and outcome."""
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._histograms: dict[tuple[str, str, str], Histogram] = {}
+
+    def __call__(self, observation: Observation) -> None:
+        """Record an observation."""
+        name, endpoint, outcome, value = observation
+        key = (name, endpoint, outcome)
+        if (histogram := self._histograms.get(key)) is None:
+            buckets = BYTES_BUCKETS if name.endswith("_bytes") else SECONDS_BUCKETS
+            histogram = self._histograms[key] = Histogram(buckets)
+        histogram.observe(value)
+
+    def get(self, name: str, endpoint: str, outcome: str = SUCCESS) -> Histogram | None:
+        """Return the histogram of a metric and labels, if observed."""
+        return self._histograms.get((name, endpoint, outcome))
+
+    def to_prometheus(self) -> str:
+        """Return the histograms in the Prometheus text exposition format."""
+        lines = []
+        for name, description in METRICS.items():
+            series = sorted(
+                (key, histogram)
+                for key, histogram in self._histograms.items()
+                if key[0] == name
+            )
+            if not series:
+                continue
+            metric = f"{PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {description}.")
+            lines.append(f"# TYPE {metric} histogram")
+            for (_, endpoint, outcome), histogram in series:
+                labels = f'endpoint="{endpoint}",outcome="{outcome}"'
+                cumulative = 0
+                for bound, count in zip(
+                    (*histogram.buckets, "+Inf"), histogram.counts, strict=True
+                ):
+                    cumulative += count
+                    le = bound if isinstance(bound, str) else _format_float(bound)
+                    lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{metric}_sum{{{labels}}} {histogram.sum!r}")
+                lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class RequestMetrics:
+    """Collector of request metrics.
+
+    Observations are passed to callback, or to a MetricsRegistry created
+    for this collector by default. Network timings are only collected for
+    sessions created with trace_config().
+    """
+
+    def __init__(self, callback: MetricsCallback | None = None) -> None:
+        """Initialize the collector."""
+        self.registry: MetricsRegistry | None = None
+        if callback is None:
+            self.registry = callback = MetricsRegistry()
+        self._callback = callback
+
+    def observe(self, name: str, endpoint: str, outcome: str, value: float) -> None:
+        """Report a measurement."""
+        self._callback(Observation(name, endpoint, outcome, value))
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a TraceConfig measuring the network phases of requests."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_dns_resolvehost_start.append(self._on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(self._on_dns_end)
+        trace_config.on_connection_create_start.append(self._on_connect_start)
+        trace_config.on_connection_create_end.append(self._on_connect_end)
+        trace_config.on_request_headers_sent.append(self._on_headers_sent)
+        trace_config.on_request_chunk_sent.append(self._on_chunk_sent)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_request_exception.append(self._on_request_exception)
+        return trace_config
+
+    async def _on_request_start(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: object
+    ) -> None:
+        """Start timing a request."""
+        ctx.start = ctx.sent = time.perf_counter()
+        ctx.dns = ctx.connect = None
+        ctx.request_bytes = 0
+
+    async def _on_dns_start(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: object
+    ) -> None:
+        """Start timing host resolution."""
+        ctx.dns_start = time.perf_counter()
+
+    async def _on_dns_end(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: object
+    ) -> None:
+        """Finish timing host resolution."""
+        ctx.dns = time.perf_counter() - ctx.dns_start
+
+    async def _on_connect_start(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: object
+    ) -> None:
+        """Start timing a new connection."""
+        ctx.connect_start = time.perf_counter()
+
+    async def _on_connect_end(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: object
+    ) -> None:
+        """Finish timing a new connection."""
+        ctx.connect = time.perf_counter() - ctx.connect_start
+
+    async def _on_headers_sent(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: object
+    ) -> None:
+        """Note when the request was sent."""
+        ctx.sent = time.perf_counter()
+
+    async def _on_chunk_sent(
+        self,
+        _: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestChunkSentParams,
+    ) -> None:
+        """Count the request body."""
+        ctx.request_bytes += len(params.chunk)
+
+    async def _on_request_end(
+        self,
+        _: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        """Report the network phases of a request."""
+        now = time.perf_counter()
+        outcome = outcome_class(params.response.status)
+        self._observe_request(ctx, outcome, now)
+        self.observe("ttfb_seconds", self._endpoint(ctx), outcome, now - ctx.sent)
+
+    async def _on_request_exception(
+        self, _: aiohttp.ClientSession, ctx: SimpleNamespace, __: object
+    ) -> None:
+        """Report the network phases of a failed request."""
+        self._observe_request(ctx, CONNECTION_ERROR, time.perf_counter())
+
+    def _observe_request(self, ctx: SimpleNamespace, outcome: str, now: float) -> None:
+        """Report the phases common to finished and failed requests."""
+        endpoint = self._endpoint(ctx)
+        self.observe("duration_seconds", endpoint, outcome, now - ctx.start)
+        if ctx.dns is not None:
+            self.observe("dns_seconds", endpoint, outcome, ctx.dns)
+        if ctx.connect is not None:
+            self.observe("connect_seconds", endpoint, outcome, ctx.connect)
+        self.observe("request_bytes", endpoint, outcome, ctx.request_bytes)
+
+    @staticmethod
+    def _endpoint(ctx: SimpleNamespace) -> str:
+        """Return the endpoint label of a traced request."""
+        if isinstance(ctx.trace_request_ctx, TraceRequestContext):
+            return ctx.trace_request_ctx.endpoint
+        return OTHER_ENDPOINT
@@ -1,18 +1,23 @@
 """Google Air Quality Library API Data Model."""
 
 import logging
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, overload
 
 from mashumaro import DataClassDictMixin, field_options
 from mashumaro.mixins.json import DataClassJSONMixin
 
+from .columns import AirQualityColumns
+from .exceptions import ApiError
 from .mapping import AQICategoryMapping
 from .pollutants import POLLUTANT_CODE_MAPPING
 
 _LOGGER = logging.getLogger(__name__)
 
+MALFORMED_RESPONSE = "Server returned malformed response"
+
 
 def lookup_normalized_generic(original: str) -> str | None:
     """Return normalized AQI category if known, otherwise None."""
@@ -26,7 +31,7 @@ def lookup_normalized_generic(original: str) -> str | None:
     return reverse_map[original_lower]
 
 
-@dataclass
+@dataclass(slots=True)
 class Concentration(DataClassDictMixin):
     """Represents a pollutant concentration."""
 
@@ -34,7 +39,7 @@ class Concentration(DataClassDictMixin):
     units: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Pollutant(DataClassDictMixin):
     """Represents a pollutant with metadata."""
 
@@ -56,17 +61,28 @@ class Pollutant(DataClassDictMixin):
 class PollutantList(list[Pollutant]):
     """Allows attribute access by pollutant code."""
 
+    __slots__ = ("_by_code",)
+
+    def __init__(self, pollutants: Iterable[Pollutant] = ()) -> None:
+        """Initialize the list and index the pollutants by code."""
+        super().__init__(pollutants)
+        self._by_code: dict[str, Pollutant] = {}
+        for pollutant in self:
+            self._by_code.setdefault(pollutant.code.lower(), pollutant)
+
+    def get(self, code: str) -> Pollutant | None:
+        """Return the pollutant with the given code (case-insensitive), or None."""
+        return self._by_code.get(code.lower())
+
     def __getattr__(self, name: str) -> Pollutant:
         """Enable dynamic access to pollutants via attribute name (case-insensitive)."""
-        name = name.lower()
-        for pollutant in self:
-            if pollutant.code.lower() == name:
-                return pollutant
-        message = f"No pollutant named {name!r}"
+        if not name.startswith("_") and (pollutant := self.get(name)) is not None:
+            return pollutant
+        message = f"No pollutant named {name.lower()!r}"
         raise AttributeError(message)
 
 
-@dataclass
+@dataclass(slots=True)
 class Color(DataClassDictMixin):
     """Represents RGB color components."""
 
@@ -75,7 +91,7 @@ class Color(DataClassDictMixin):
     blue: float | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Index(DataClassDictMixin):
     """Represents an air quality index entry."""
 
@@ -108,35 +124,78 @@ class Index(DataClassDictMixin):
 class IndexList(list[Index]):
     """Allows semantic access to air quality indexes."""
 
+    __slots__ = ("_by_code", "_laqi")
+
+    def __init__(self, indexes: Iterable[Index] = ()) -> None:
+        """Initialize the list and index the entries by code."""
+        super().__init__(indexes)
+        self._by_code: dict[str, Index] = {}
+        for index in self:
+            self._by_code.setdefault(index.code, index)
+        self._laqi = next((index for index in self if index.code != "uaqi"), None)
+
+    def get(self, code: str) -> Index | None:
+        """Return the index with the given code, or None."""
+        return self._by_code.get(code)
+
     @property
     def uaqi(self) -> Index | None:
         """Return the universal AQI index, if available."""
-        return next((index for index in self if index.code == "uaqi"), None)
+        return self._by_code.get("uaqi")
 
     @property
     def laqi(self) -> Index | None:
         """Return the local AQI index, if available."""
-        return next((index for index in self if index.code != "uaqi"), None)
+        return self._laqi
 
+    @property
+    def laqis(self) -> list[Index]:
+        """Return every local AQI index."""
+        return [index for index in self if index.code != "uaqi"]
+
+    def __getattr__(self, name: str) -> Index:
+        """Enable dynamic access to indexes via their code."""
+        if not name.startswith("_") and (index := self.get(name)) is not None:
+            return index
+        message = f"No index named {name!r}"
+        raise AttributeError(message)
 
-@dataclass
-class AirQualityCurrentConditionsData(DataClassJSONMixin):
+
+class _IndexedLists:
+    """Slots holding the wrapped lists of a response, built on first access."""
+
+    __slots__ = ("_index_list", "_pollutant_list")
+
+
+@dataclass(slots=True)
+class AirQualityCurrentConditionsData(_IndexedLists, DataClassJSONMixin):
     """Holds air quality data with timestamp and region."""
 
     date_time: datetime = field(metadata={"alias": "dateTime"})
-    _indexes: list[Index] = field(metadata={"alias": "indexes"})
-    _pollutants: list[Pollutant] = field(metadata={"alias": "pollutants"})
+    _indexes: list[Index] = field(default_factory=list, metadata={"alias": "indexes"})
+    _pollutants: list[Pollutant] = field(
+        default_factory=list, metadata={"alias": "pollutants"}
+    )
     region_code: str | None = field(metadata={"alias": "regionCode"}, default=None)
 
+    def __post_init__(self) -> None:
+        """Reset the wrapped lists."""
+        self._index_list: IndexList | None = None
+        self._pollutant_list: PollutantList | None = None
+
     @property
     def indexes(self) -> IndexList:
         """Returns list of indexes with attribute access."""
-        return IndexList(self._indexes)
+        if self._index_list is None:
+            self._index_list = IndexList(self._indexes)
+        return self._index_list
 
     @property
     def pollutants(self) -> PollutantList:
         """Returns list of pollutants with attribute access."""
-        return PollutantList(self._pollutants)
+        if self._pollutant_list is None:
+            self._pollutant_list = PollutantList(self._pollutants)
+        return self._pollutant_list
 
 
 @dataclass
@@ -146,7 +205,127 @@ class AirQualityForecastData(DataClassJSONMixin):
     hourly_forecasts: list[AirQualityCurrentConditionsData] = field(
         metadata={"alias": "hourlyForecasts"}
     )
-    region_code: str = field(metadata={"alias": "regionCode"})
+    region_code: str | None = field(default=None, metadata={"alias": "regionCode"})
+    next_page_token: str | None = field(
+        default=None, metadata={"alias": "nextPageToken"}
+    )
+
+    def to_columns(self) -> AirQualityColumns:
+        """Return the hourly forecasts as columns."""
+        return AirQualityColumns.from_hours(self.hourly_forecasts)
+
+
+class LazyHourlyList(Sequence[AirQualityCurrentConditionsData]):
+    """Hourly records that are deserialized on first access.
+
+    The raw record is released once it has been deserialized.
+    """
+
+    __slots__ = ("_items", "_raw")
+
+    def __init__(self, raw: Iterable[dict[str, Any]] = ()) -> None:
+        """Initialize the list from raw hourly records."""
+        self._raw: list[dict[str, Any] | None] = list(raw)
+        self._items: list[AirQualityCurrentConditionsData | None] = [None] * len(
+            self._raw
+        )
+
+    def __len__(self) -> int:
+        """Return the number of hours."""
+        return len(self._raw)
+
+    @overload
+    def __getitem__(self, index: int) -> AirQualityCurrentConditionsData: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[AirQualityCurrentConditionsData]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> AirQualityCurrentConditionsData | list[AirQualityCurrentConditionsData]:
+        """Return the deserialized hour(s) at index."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = self._items[index]
+        if item is None:
+            raw = self._raw[index]
+            assert raw is not None
+            try:
+                item = AirQualityCurrentConditionsData.from_dict(raw)
+            except (LookupError, ValueError) as err:
+                # Raised like a malformed response parsed eagerly by Auth.
+                message = f"{MALFORMED_RESPONSE}: {err}"
+                raise ApiError(message) from err
+            self._items[index] = item
+            self._raw[index] = None
+        return item
+
+    def __iter__(self) -> Iterator[AirQualityCurrentConditionsData]:
+        """Iterate over the hours, deserializing them one at a time."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the hours with another sequence."""
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            mine == theirs for mine, theirs in zip(self, other, strict=True)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return a summary without deserializing any hour."""
+        return f"LazyHourlyList({len(self)} hours, {self.loaded} loaded)"
+
+    @property
+    def loaded(self) -> int:
+        """Return the number of deserialized hours."""
+        return sum(item is not None for item in self._items)
+
+    def extend(self, other: "LazyHourlyList") -> None:
+        """Append the hours of another list, e.g. of a following page."""
+        self._raw.extend(other._raw)  # noqa: SLF001
+        self._items.extend(other._items)  # noqa: SLF001
+
+
+@dataclass
+class LazyAirQualityForecastData(DataClassJSONMixin):
+    """Forecast whose hourly records are deserialized on first access."""
+
+    hourly_forecasts: LazyHourlyList = field(
+        metadata=field_options(
+            alias="hourlyForecasts",
+            deserialize=LazyHourlyList,
+            serialize=lambda hours: [hour.to_dict() for hour in hours],
+        )
+    )
+    region_code: str | None = field(default=None, metadata={"alias": "regionCode"})
+    next_page_token: str | None = field(
+        default=None, metadata={"alias": "nextPageToken"}
+    )
+
+    def to_columns(self) -> AirQualityColumns:
+        """Return the hourly forecasts as columns."""
+        return AirQualityColumns.from_hours(self.hourly_forecasts)
+
+
+@dataclass
+class AirQualityHistoryData(DataClassJSONMixin):
+    """Holds hourly historical air quality data."""
+
+    hours_info: list[AirQualityCurrentConditionsData] = field(
+        default_factory=list, metadata={"alias": "hoursInfo"}
+    )
+    region_code: str | None = field(default=None, metadata={"alias": "regionCode"})
+    next_page_token: str | None = field(
+        default=None, metadata={"alias": "nextPageToken"}
+    )
+
+    def to_columns(self) -> AirQualityColumns:
+        """Return the hourly records as columns."""
+        return AirQualityColumns.from_hours(self.hours_info)
 
 
 @dataclass
@@ -0,0 +1,68 @@
+"""Client-side rate limiting for Google Air Quality API requests."""
+
+import asyncio
+import time
+from collections.abc import Callable
+
+SECONDS_PER_MINUTE = 60
+INVALID_RATE = "requests_per_minute must be positive"
+INVALID_BURST = "burst must be at least 1"
+
+
+class TokenBucket:
+    """Token bucket limiting requests to a per-minute quota.
+
+    Callers that find the bucket empty wait in arrival order until a token
+    has been refilled, instead of sending a request that would be rejected.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        burst: int | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the bucket.
+
+        burst is the number of requests that may be sent back to back after
+        an idle period and defaults to one second worth of requests.
+        """
+        if requests_per_minute <= 0:
+            raise ValueError(INVALID_RATE)
+        self._rate = requests_per_minute / SECONDS_PER_MINUTE
+        if burst is None:
+            burst = max(1, int(self._rate))
+        if burst < 1:
+            raise ValueError(INVALID_BURST)
+        self._capacity = float(burst)
+        self._tokens = self._capacity
+        self._clock = clock
+        self._updated = clock()
+        # asyncio.Lock wakes waiters in FIFO order, which keeps queuing fair.
+        self._lock = asyncio.Lock()
+        self.waits = 0
+
+    @property
+    def available_tokens(self) -> float:
+        """Return the number of tokens currently in the bucket."""
+        self._refill()
+        return self._tokens
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent and take a token."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                self.waits += 1
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update."""
+        now = self._clock()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
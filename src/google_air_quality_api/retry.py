@@ -0,0 +1,84 @@
+"""Retry policy for transient Google Air Quality API failures."""
+
+import random
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+
+import aiohttp
+
+RETRYABLE_STATUSES = frozenset(
+    {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+INVALID_MAX_ATTEMPTS = "max_attempts must be at least 1"
+
+
+@dataclass
+class RetryStats:
+    """Counters showing how much retrying amplifies the request volume."""
+
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    exhausted: int = 0
+
+    @property
+    def amplification(self) -> float:
+        """Return the average number of attempts per request."""
+        return self.attempts / self.requests if self.requests else 0.0
+
+
+@dataclass
+class RetryPolicy:
+    """Configuration of retries with decorrelated jitter backoff.
+
+    Responses with a status in retry_statuses and connection errors are
+    retried; every other error is terminal. A Retry-After header extends the
+    next delay. No retry is started that would end after the deadline,
+    measured in seconds from the first attempt.
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    deadline: float | None = 60.0
+    retry_statuses: frozenset[int] = RETRYABLE_STATUSES
+    stats: RetryStats = field(default_factory=RetryStats)
+
+    def __post_init__(self) -> None:
+        """Validate the policy."""
+        if self.max_attempts < 1:
+            raise ValueError(INVALID_MAX_ATTEMPTS)
+
+    def next_delay(self, previous: float, requested: float | None = None) -> float:
+        """Return the delay before the next attempt.
+
+        A delay requested by the server takes precedence when it is longer.
+        """
+        upper = max(self.base_delay, previous * 3)
+        delay = min(self.max_delay, random.uniform(self.base_delay, upper))  # noqa: S311
+        if requested is not None:
+            delay = max(delay, requested)
+        return delay
+
+
+def retry_after(resp: aiohttp.ClientResponse) -> float | None:
+    """Return the delay requested by a Retry-After header, in seconds."""
+    if (value := resp.headers.get("Retry-After")) is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(tz=UTC)).total_seconds())
@@ -0,0 +1,145 @@
+"""Persistent SQLite store of Google Air Quality API responses."""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, TypeVar
+
+from .cache import SECONDS_PER_HOUR, normalize_payload
+
+_LOGGER = logging.getLogger(__name__)
+
+_R = TypeVar("_R")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    body BLOB NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+def response_time(response: Any) -> datetime | None:
+    """Return the dateTime a deserialized response reports data for."""
+    if (date_time := getattr(response, "date_time", None)) is not None:
+        return date_time
+    hours = getattr(response, "hourly_forecasts", None) or getattr(
+        response, "hours_info", None
+    )
+    if hours:
+        return hours[0].date_time
+    return None
+
+
+class SQLiteResponseStore:
+    """Store of raw response bodies that survives restarts.
+
+    The database runs in WAL mode and is only accessed from a dedicated
+    worker thread, so reads and writes never block the event loop. An entry
+    expires validity seconds after the dateTime of its response, and at the
+    latest max_age seconds after it was stored.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        validity: float = SECONDS_PER_HOUR,
+        max_age: float = SECONDS_PER_HOUR,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the store."""
+        self._path = str(path)
+        self._validity = validity
+        self._max_age = max_age
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="google_air_quality_store"
+        )
+        self._connection: sqlite3.Connection | None = None
+
+    def key(self, url: str, data_cls: type, payload: Mapping[str, Any]) -> str:
+        """Return the store key for a request."""
+        return f"{url}|{data_cls.__qualname__}|{normalize_payload(payload)}"
+
+    async def async_get(self, key: str) -> bytes | None:
+        """Return the body of a fresh stored response, or None."""
+        return await self._run(self._get, key, self._clock())
+
+    async def async_set(self, url: str, key: str, body: bytes, response: Any) -> None:
+        """Store the body of a response made to the url endpoint."""
+        now = self._clock()
+        expires_at = now + self._max_age
+        if (date_time := response_time(response)) is not None:
+            expires_at = min(expires_at, date_time.timestamp() + self._validity)
+        if expires_at > now:
+            await self._run(self._set, key, url, body, expires_at)
+
+    async def async_purge(self) -> None:
+        """Delete expired responses."""
+        await self._run(self._purge, self._clock())
+
+    async def async_close(self) -> None:
+        """Close the database and stop the worker thread."""
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
+
+    async def _run(self, func: Callable[..., _R], *args: Any) -> _R | None:
+        """Run a database operation in the worker thread.
+
+        Database errors are logged rather than failing the API request.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, func, *args)
+        except sqlite3.Error as err:
+            _LOGGER.warning("Response store %s failed: %s", self._path, err)
+            return None
+
+    def _db(self) -> sqlite3.Connection:
+        """Return the connection, opening the database on first use."""
+        if self._connection is None:
+            connection = sqlite3.connect(self._path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _get(self, key: str, now: float) -> bytes | None:
+        """Read a fresh response body."""
+        row = (
+            self._db()
+            .execute(
+                "SELECT body FROM responses WHERE key = ? AND expires_at > ?",
+                (key, now),
+            )
+            .fetchone()
+        )
+        return None if row is None else bytes(row[0])
+
+    def _set(self, key: str, url: str, body: bytes, expires_at: float) -> None:
+        """Write a response body."""
+        with self._db() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, url, body, expires_at),
+            )
+
+    def _purge(self, now: float) -> None:
+        """Delete expired responses."""
+        with self._db() as db:
+            db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+
+    def _close(self) -> None:
+        """Close the connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
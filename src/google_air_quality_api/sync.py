@@ -0,0 +1,218 @@
+"""Synchronous client for the Google Air Quality API."""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Coroutine, Iterable, Mapping
+from contextlib import AsyncExitStack
+from datetime import timedelta
+from types import TracebackType
+from typing import Any, Self, TypeVar
+
+from .api import (
+    DEFAULT_HISTORY_PAGE_SIZE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PROFILE,
+    CurrentConditionsRequest,
+    CurrentConditionsResult,
+    GoogleAirQualityApi,
+    Period,
+    RequestProfile,
+)
+from .auth import Auth, ConnectionStats
+from .model import (
+    AirQualityCurrentConditionsData,
+    AirQualityForecastData,
+    AirQualityHistoryData,
+)
+from .tiles import TileCache
+
+_R = TypeVar("_R")
+
+DEFAULT_TIMEOUT = 60.0
+CLIENT_CLOSED = "The client is closed"
+CALLED_FROM_LOOP = "The synchronous client cannot be used from its own event loop"
+
+
+class GoogleAirQualityClient:
+    """Blocking client that can be shared by any number of threads.
+
+    A single event loop runs in a background thread and owns the session
+    created by Auth.create, so connections and caches are reused by every
+    call. Calls wait at most timeout seconds for their result.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        tile_cache: TileCache | None = None,
+        profile: RequestProfile = DEFAULT_PROFILE,
+        **kwargs: Any,
+    ) -> None:
+        """Start the event loop and open the session.
+
+        Keyword arguments not listed are passed to Auth.create.
+        """
+        self._timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="google_air_quality_api", daemon=True
+        )
+        self._thread.start()
+        self._stack = AsyncExitStack()
+        self._closed = False
+
+        async def open_api() -> tuple[Auth, GoogleAirQualityApi]:
+            auth = await self._stack.enter_async_context(Auth.create(api_key, **kwargs))
+            api = GoogleAirQualityApi(auth, tile_cache=tile_cache, profile=profile)
+            return auth, api
+
+        try:
+            self._auth, self._api = self._submit(open_api())
+        except BaseException:
+            self._stop()
+            raise
+
+    def __enter__(self) -> Self:
+        """Return the client."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the client."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the session and stop the event loop."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._submit(self._stack.aclose())
+        finally:
+            self._stop()
+
+    def run(self, func: Callable[[GoogleAirQualityApi], Awaitable[_R]]) -> _R:
+        """Run func with the async API on the event loop and return its result.
+
+        Use this for API methods without a synchronous counterpart.
+        """
+        if self._closed:
+            raise RuntimeError(CLIENT_CLOSED)
+
+        async def call() -> _R:
+            return await func(self._api)
+
+        return self._submit(call())
+
+    def get_current_conditions(  # noqa: PLR0913
+        self,
+        lat: float,
+        lon: float,
+        region_code: str | None = None,
+        custom_local_aqi: str | None = None,
+        custom_local_aqis: Mapping[str, str] | None = None,
+        *,
+        profile: RequestProfile | None = None,
+    ) -> AirQualityCurrentConditionsData:
+        """Get current air quality data."""
+        return self.run(
+            lambda api: api.async_get_current_conditions(
+                lat,
+                lon,
+                region_code,
+                custom_local_aqi,
+                custom_local_aqis,
+                profile=profile,
+            )
+        )
+
+    def get_current_conditions_batch(
+        self,
+        requests: Iterable[CurrentConditionsRequest | tuple],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        profile: RequestProfile | None = None,
+    ) -> list[CurrentConditionsResult]:
+        """Get current conditions for many locations, in input order."""
+        return self.run(
+            lambda api: api.async_get_current_conditions_batch(
+                requests, max_concurrency=max_concurrency, profile=profile
+            )
+        )
+
+    def get_forecast(
+        self,
+        lat: float,
+        lon: float,
+        forecast_timedelta: timedelta,
+        *,
+        profile: RequestProfile | None = None,
+    ) -> AirQualityForecastData:
+        """Get air quality forecast data."""
+        return self.run(
+            lambda api: api.async_get_forecast(
+                lat, lon, forecast_timedelta, profile=profile
+            )
+        )
+
+    def get_history(  # noqa: PLR0913
+        self,
+        lat: float,
+        lon: float,
+        *,
+        hours: int | None = None,
+        period: Period | None = None,
+        page_size: int = DEFAULT_HISTORY_PAGE_SIZE,
+        profile: RequestProfile | None = None,
+    ) -> AirQualityHistoryData:
+        """Get historical air quality data for the last hours or a period."""
+        return self.run(
+            lambda api: api.async_get_history(
+                lat,
+                lon,
+                hours=hours,
+                period=period,
+                page_size=page_size,
+                profile=profile,
+            )
+        )
+
+    def get_heatmap_tile(self, map_type: str, zoom: int, x: int, y: int) -> bytes:
+        """Get a heatmap tile as PNG image data."""
+
+        async def get_tile(api: GoogleAirQualityApi) -> bytes:
+            # Copied so that the data stays valid when the tile is evicted.
+            return bytes(await api.async_get_heatmap_tile(map_type, zoom, x, y))
+
+        return self.run(get_tile)
+
+    def connection_stats(self) -> ConnectionStats:
+        """Return the connection pool usage of the session."""
+
+        async def stats(_: GoogleAirQualityApi) -> ConnectionStats:
+            return self._auth.connection_stats()
+
+        return self.run(stats)
+
+    def _submit(self, coro: Coroutine[Any, Any, _R]) -> _R:
+        """Run a coroutine on the event loop and wait for its result."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError(CALLED_FROM_LOOP)
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(self._timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def _stop(self) -> None:
+        """Stop the event loop and wait for its thread."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
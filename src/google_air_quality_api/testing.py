@@ -0,0 +1,391 @@
+"""Local emulator of the Google Air Quality API for tests and load tests.
+
+The emulator serves currentConditions:lookup, forecast:lookup and
+history:lookup with synthetic data that depends on location and time, and
+can inject latency, server errors, quota exhaustion and regions without data.
+"""
+
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import web
+
+from .grid import BoundingBox
+from .mapping import AQICategoryMapping
+from .pollutants import POLLUTANT_CODE_MAPPING
+
+LatencyDistribution = Callable[[random.Random], float]
+
+DEFAULT_PREFIX = "/v1"
+DEFAULT_FORECAST_PAGE_SIZE = 24
+DEFAULT_HISTORY_PAGE_SIZE = 72
+NO_DATA_MESSAGE = "Information is unavailable for this location."
+UNSUPPORTED_LAQI_MESSAGE = "One or more LAQIs are not supported"
+
+# Pollutant code: display name, full name, units, typical concentration.
+POLLUTANTS: dict[str, tuple[str, str, str, float]] = {
+    "co": ("CO", "Carbon monoxide", "PARTS_PER_BILLION", 200.0),
+    "no2": ("NO2", "Nitrogen dioxide", "PARTS_PER_BILLION", 15.0),
+    "o3": ("O3", "Ozone", "PARTS_PER_BILLION", 35.0),
+    "pm10": (
+        "PM10",
+        "Inhalable particulate matter (<10µm)",
+        "MICROGRAMS_PER_CUBIC_METER",
+        15.0,
+    ),
+    "pm25": (
+        "PM2.5",
+        "Fine particulate matter (<2.5µm)",
+        "MICROGRAMS_PER_CUBIC_METER",
+        6.0,
+    ),
+    "so2": ("SO2", "Sulfur dioxide", "PARTS_PER_BILLION", 1.5),
+    "nh3": ("NH3", "Ammonia", "PARTS_PER_BILLION", 5.0),
+    "no": ("NO", "Nitrogen monoxide", "PARTS_PER_BILLION", 3.0),
+    "nox": ("NOX", "Nitrogen oxides", "PARTS_PER_BILLION", 20.0),
+    "c6h6": ("C6H6", "Benzene", "MICROGRAMS_PER_CUBIC_METER", 1.0),
+}
+
+
+def fixed_latency(seconds: float) -> LatencyDistribution:
+    """Return a latency distribution that always delays by seconds."""
+    return lambda _: seconds
+
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> LatencyDistribution:
+    """Return a log-normal latency distribution, with a long tail."""
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def _error(status: HTTPStatus, reason: str, message: str) -> web.Response:
+    """Return an error response in the format of Google APIs."""
+    return web.json_response(
+        {"error": {"code": status.value, "message": message, "status": reason}},
+        status=status,
+    )
+
+
+def _hour(value: str) -> datetime:
+    """Parse a timestamp and truncate it to the hour."""
+    date_time = datetime.fromisoformat(value)
+    return date_time.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+def _current_hour() -> datetime:
+    """Return the start of the current hour."""
+    return datetime.now(tz=UTC).replace(minute=0, second=0, microsecond=0)
+
+
+@dataclass
+class EmulatorStats:
+    """Counters of the requests served by the emulator."""
+
+    requests: Counter[str] = field(default_factory=Counter)
+    errors: int = 0
+    throttled: int = 0
+    no_data: int = 0
+
+
+class AirQualityEmulator:
+    """An aiohttp application emulating the Google Air Quality API.
+
+    Every request is delayed by a sample of latency. A share error_rate of
+    the requests fails with error_status, and requests beyond quota within a
+    quota_window are rejected with 429 and a Retry-After header. Locations
+    inside no_data_regions fail like locations the API has no data for.
+    Pass a seed to make injected latency and errors reproducible.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        latency: LatencyDistribution | None = None,
+        error_rate: float = 0.0,
+        error_status: HTTPStatus = HTTPStatus.SERVICE_UNAVAILABLE,
+        quota: int | None = None,
+        quota_window: float = 60.0,
+        no_data_regions: Sequence[BoundingBox] = (),
+        region_code: str = "de",
+        laqi: str = "deu_uba",
+        api_key: str | None = None,
+        seed: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the emulator."""
+        self._latency = latency
+        self._error_rate = error_rate
+        self._error_status = error_status
+        self._quota = quota
+        self._quota_window = quota_window
+        self._no_data_regions = tuple(no_data_regions)
+        self._region_code = region_code
+        self._laqi = laqi
+        self._api_key = api_key
+        self._random = random.Random(seed)  # noqa: S311
+        self._clock = clock
+        self._window_start = clock()
+        self._window_requests = 0
+        self._runner: web.AppRunner | None = None
+        self.stats = EmulatorStats()
+
+    def app(self, prefix: str = DEFAULT_PREFIX) -> web.Application:
+        """Return an application serving the lookup endpoints under prefix."""
+        app = web.Application()
+        app.router.add_post(f"{prefix}/currentConditions:lookup", self._current)
+        app.router.add_post(f"{prefix}/forecast:lookup", self._forecast)
+        app.router.add_post(f"{prefix}/history:lookup", self._history)
+        return app
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve the emulator on a local port and return its base url.
+
+        Pass the url as host to Auth.
+        """
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        self._runner = runner
+        address = runner.addresses[0]
+        return f"http://{address[0]}:{address[1]}{DEFAULT_PREFIX}"
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def hour(
+        self,
+        lat: float,
+        lon: float,
+        date_time: datetime,
+        payload: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Return the synthetic record of a location and hour.
+
+        Values vary smoothly with the location and follow a daily cycle.
+        """
+        payload = payload or {}
+        extra = payload.get("extraComputations", ())
+        laqi = self._requested_laqi(payload) or self._laqi
+        codes = list(
+            dict.fromkeys(
+                [*POLLUTANT_CODE_MAPPING["uaqi"], *POLLUTANT_CODE_MAPPING.get(laqi, ())]
+            )
+        )
+        phase = date_time.timestamp() / 3600 * math.pi / 12
+        level = (
+            1
+            + 0.4 * math.sin(math.radians(lat) * 7 + phase)
+            + 0.3 * math.cos(math.radians(lon) * 5)
+        )
+        indexes = []
+        if payload.get("universalAqi", True):
+            indexes.append(self._index("uaqi", round(100 - 35 * level)))
+        if "LOCAL_AQI" in extra:
+            indexes.append(self._index(laqi, max(1, round(2 * level))))
+        record: dict[str, Any] = {"dateTime": date_time.isoformat(), "indexes": indexes}
+        if "POLLUTANT_CONCENTRATION" in extra:
+            record["pollutants"] = [
+                self._pollutant(code, level) for code in codes if code in POLLUTANTS
+            ]
+        return record
+
+    @staticmethod
+    def _index(code: str, aqi: int) -> dict[str, Any]:
+        """Return an index entry with the category matching aqi."""
+        categories = (
+            AQICategoryMapping.get(code) or AQICategoryMapping.get("uaqi") or []
+        )
+        position = (100 - aqi) * len(categories) // 100 if code == "uaqi" else aqi - 1
+        category = categories[min(max(position, 0), len(categories) - 1)]
+        return {
+            "code": code,
+            "displayName": "Universal AQI" if code == "uaqi" else f"AQI ({code})",
+            "aqi": aqi,
+            "aqiDisplay": str(aqi),
+            "color": {"red": 0.5, "green": 0.8, "blue": 0.2},
+            "category": category.original,
+            "dominantPollutant": "o3",
+        }
+
+    @staticmethod
+    def _pollutant(code: str, level: float) -> dict[str, Any]:
+        """Return a pollutant entry."""
+        display_name, full_name, units, typical = POLLUTANTS[code]
+        return {
+            "code": code,
+            "displayName": display_name,
+            "fullName": full_name,
+            "concentration": {"value": round(typical * level, 2), "units": units},
+        }
+
+    async def _current(self, request: web.Request) -> web.Response:
+        """Handle currentConditions:lookup."""
+        payload, error = await self._admit(request, "currentConditions")
+        if error is not None:
+            return error
+        lat, lon = self._location(payload)
+        return web.json_response(
+            {
+                "regionCode": self._region_code,
+                **self.hour(lat, lon, _current_hour(), payload),
+            }
+        )
+
+    async def _forecast(self, request: web.Request) -> web.Response:
+        """Handle forecast:lookup."""
+        payload, error = await self._admit(request, "forecast")
+        if error is not None:
+            return error
+        return self._pages(
+            payload, "hourlyForecasts", _current_hour() + timedelta(hours=1)
+        )
+
+    async def _history(self, request: web.Request) -> web.Response:
+        """Handle history:lookup."""
+        payload, error = await self._admit(request, "history")
+        if error is not None:
+            return error
+        end_time = _current_hour()
+        if (hours := payload.get("hours")) is not None:
+            payload = {
+                **payload,
+                "period": {
+                    "startTime": (end_time - timedelta(hours=hours)).isoformat(),
+                    "endTime": end_time.isoformat(),
+                },
+            }
+        return self._pages(payload, "hoursInfo", end_time - timedelta(hours=1))
+
+    def _pages(
+        self, payload: dict[str, Any], key: str, default_start: datetime
+    ) -> web.Response:
+        """Return one page of hourly records.
+
+        Page tokens are the offset of the first record of the page.
+        """
+        lat, lon = self._location(payload)
+        if "dateTime" in payload:
+            start_time = _hour(payload["dateTime"])
+            count = 1
+        elif "period" in payload:
+            start_time = _hour(payload["period"]["startTime"])
+            end_time = _hour(payload["period"]["endTime"])
+            count = max(0, int((end_time - start_time).total_seconds() // 3600))
+        else:
+            start_time, count = default_start, 1
+        default_page_size = (
+            DEFAULT_HISTORY_PAGE_SIZE
+            if key == "hoursInfo"
+            else DEFAULT_FORECAST_PAGE_SIZE
+        )
+        page_size = payload.get("pageSize") or default_page_size
+        offset = int(payload.get("pageToken") or 0)
+        end = min(count, offset + page_size)
+        body: dict[str, Any] = {
+            key: [
+                self.hour(lat, lon, start_time + timedelta(hours=index), payload)
+                for index in range(offset, end)
+            ],
+            "regionCode": self._region_code,
+        }
+        if end < count:
+            body["nextPageToken"] = str(end)
+        return web.json_response(body)
+
+    async def _admit(
+        self, request: web.Request, endpoint: str
+    ) -> tuple[dict[str, Any], web.Response | None]:
+        """Apply latency and injected failures, and validate a request.
+
+        Returns the payload and an error response, if the request failed.
+        """
+        self.stats.requests[endpoint] += 1
+        if self._latency is not None:
+            await asyncio.sleep(self._latency(self._random))
+        payload: dict[str, Any] = {}
+        if (error := self._throttle()) is not None:
+            self.stats.throttled += 1
+        elif self._api_key is not None and request.query.get("key") != self._api_key:
+            error = _error(
+                HTTPStatus.FORBIDDEN, "PERMISSION_DENIED", "API key not valid."
+            )
+        elif self._random.random() < self._error_rate:
+            error = _error(
+                self._error_status,
+                "UNAVAILABLE",
+                "The service is currently unavailable.",
+            )
+        else:
+            payload, error = await self._validate(request)
+        if error is not None:
+            self.stats.errors += 1
+        return payload, error
+
+    def _throttle(self) -> web.Response | None:
+        """Count a request against the quota and reject it when exceeded."""
+        if self._quota is None:
+            return None
+        now = self._clock()
+        if now - self._window_start >= self._quota_window:
+            self._window_start = now
+            self._window_requests = 0
+        self._window_requests += 1
+        if self._window_requests <= self._quota:
+            return None
+        response = _error(
+            HTTPStatus.TOO_MANY_REQUESTS, "RESOURCE_EXHAUSTED", "Quota exceeded."
+        )
+        retry_after = self._window_start + self._quota_window - now
+        response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return response
+
+    async def _validate(
+        self, request: web.Request
+    ) -> tuple[dict[str, Any], web.Response | None]:
+        """Return the payload of a valid request, or an error response."""
+        try:
+            payload = await request.json()
+            lat, lon = self._location(payload)
+        except (LookupError, TypeError, ValueError):
+            return {}, _error(
+                HTTPStatus.BAD_REQUEST, "INVALID_ARGUMENT", "Invalid location."
+            )
+        supported = AQICategoryMapping.get_all_laq_indices()
+        if any(
+            custom.get("aqi") not in supported
+            for custom in payload.get("customLocalAqis", ())
+        ):
+            return payload, _error(
+                HTTPStatus.BAD_REQUEST, "INVALID_ARGUMENT", UNSUPPORTED_LAQI_MESSAGE
+            )
+        for south, west, north, east in self._no_data_regions:
+            if south <= lat <= north and west <= lon <= east:
+                self.stats.no_data += 1
+                return payload, _error(
+                    HTTPStatus.BAD_REQUEST, "INVALID_ARGUMENT", NO_DATA_MESSAGE
+                )
+        return payload, None
+
+    @staticmethod
+    def _location(payload: dict[str, Any]) -> tuple[float, float]:
+        """Return the requested location."""
+        location = payload["location"]
+        return float(location["latitude"]), float(location["longitude"])
+
+    def _requested_laqi(self, payload: dict[str, Any]) -> str | None:
+        """Return the custom local AQI requested for the region, if any."""
+        for custom in payload.get("customLocalAqis", ()):
+            if custom.get("regionCode", "").lower() == self._region_code.lower():
+                return custom.get("aqi")
+        return None
@@ -0,0 +1,203 @@
+"""Byte-budgeted cache for heatmap tiles."""
+
+import asyncio
+import contextlib
+import itertools
+import mmap
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+from .cache import CacheStats
+
+HEATMAP_MAP_TYPES = (
+    "UAQI_RED_GREEN",
+    "UAQI_INDIGO_PERSIAN",
+    "PM25_INDIGO_PERSIAN",
+    "GBR_DEFRA",
+    "DEU_UBA",
+    "CAN_EC",
+    "FRA_ATMO",
+    "US_AQI",
+)
+DEFAULT_TILE_CACHE_BYTES = 64 * 1024 * 1024
+DEFAULT_TILE_TTL = 3600
+UNKNOWN_MAP_TYPE = "Unknown heatmap map type"
+
+
+def tile_path(map_type: str, zoom: int, x: int, y: int) -> str:
+    """Return the API path of a heatmap tile."""
+    if map_type not in HEATMAP_MAP_TYPES:
+        message = f"{UNKNOWN_MAP_TYPE}: {map_type}"
+        raise ValueError(message)
+    return f"mapTypes/{map_type}/heatmapTiles/{zoom}/{x}/{y}"
+
+
+def _map_file(path: Path, data: bytes) -> mmap.mmap:
+    """Write data to a file and return a read-only memory map of it."""
+    path.write_bytes(data)
+    with path.open("rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _MemoryTile(NamedTuple):
+    """A tile held in memory."""
+
+    data: bytes
+    expires_at: float
+
+
+class _SpilledTile(NamedTuple):
+    """A tile spilled to a memory-mapped file."""
+
+    path: Path
+    data: mmap.mmap
+    expires_at: float
+
+
+class TileCache:
+    """LRU cache of tile images bounded by their total size.
+
+    Tiles evicted from memory are written to spill_dir, if given, and served
+    from memory-mapped files until the spill budget is exceeded. Hits are
+    returned as read-only memoryviews of the cached data, without copying.
+    Use async_set on the event loop, set writes spilled tiles synchronously.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_TILE_CACHE_BYTES,
+        *,
+        ttl: float = DEFAULT_TILE_TTL,
+        spill_dir: Path | str | None = None,
+        spill_max_bytes: int | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the cache."""
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._spill_dir = None if spill_dir is None else Path(spill_dir)
+        self._spill_max_bytes = spill_max_bytes
+        self._clock = clock
+        self._memory: OrderedDict[str, _MemoryTile] = OrderedDict()
+        self._spilled: OrderedDict[str, _SpilledTile] = OrderedDict()
+        self._memory_bytes = 0
+        self._spilled_bytes = 0
+        # Spill files are numbered so that a tile spilled again never
+        # overwrites a file that may still be mapped.
+        self._spill_ids = itertools.count()
+        self.stats = CacheStats()
+        if self._spill_dir is not None:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        """Return the number of cached tiles."""
+        return len(self._memory) + len(self._spilled)
+
+    @property
+    def size_bytes(self) -> int:
+        """Return the size of the tiles held in memory."""
+        return self._memory_bytes
+
+    @property
+    def spilled_bytes(self) -> int:
+        """Return the size of the tiles spilled to disk."""
+        return self._spilled_bytes
+
+    def get(self, key: str) -> memoryview | None:
+        """Return a fresh cached tile, or None."""
+        now = self._clock()
+        if (tile := self._memory.get(key)) is not None:
+            if tile.expires_at > now:
+                self._memory.move_to_end(key)
+                self.stats.hits += 1
+                return memoryview(tile.data)
+            self._remove_memory(key)
+        elif (spilled := self._spilled.get(key)) is not None:
+            if spilled.expires_at > now:
+                self._spilled.move_to_end(key)
+                self.stats.hits += 1
+                return memoryview(spilled.data)
+            self._remove_spilled(key)
+        self.stats.misses += 1
+        return None
+
+    def set(self, key: str, data: bytes) -> None:
+        """Store a tile, writing evicted tiles to the spill directory."""
+        for evicted_key, tile in self._store(key, data):
+            if (path := self._spill_path(evicted_key, tile)) is not None:
+                self._add_spilled(evicted_key, tile, path, _map_file(path, tile.data))
+
+    async def async_set(self, key: str, data: bytes) -> None:
+        """Store a tile, writing evicted tiles in a worker thread."""
+        for evicted_key, tile in self._store(key, data):
+            if (path := self._spill_path(evicted_key, tile)) is not None:
+                mapped = await asyncio.to_thread(_map_file, path, tile.data)
+                self._add_spilled(evicted_key, tile, path, mapped)
+
+    def _store(self, key: str, data: bytes) -> list[tuple[str, _MemoryTile]]:
+        """Store a tile in memory and return the tiles evicted from it."""
+        self._remove_memory(key)
+        self._remove_spilled(key)
+        tile = _MemoryTile(data, self._clock() + self._ttl)
+        if len(data) > self._max_bytes:
+            return [(key, tile)]
+        self._memory[key] = tile
+        self._memory_bytes += len(data)
+        evicted = []
+        while self._memory_bytes > self._max_bytes:
+            evicted_key, evicted_tile = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted_tile.data)
+            self.stats.evictions += 1
+            evicted.append((evicted_key, evicted_tile))
+        return evicted
+
+    def clear(self) -> None:
+        """Remove all tiles, including spilled ones."""
+        for key in list(self._memory):
+            self._remove_memory(key)
+        for key in list(self._spilled):
+            self._remove_spilled(key)
+
+    def _spill_path(self, key: str, tile: _MemoryTile) -> Path | None:
+        """Return the file to spill a tile to, or None if it is not spilled."""
+        if self._spill_dir is None or not tile.data:
+            return None
+        if self._spill_max_bytes is not None and len(tile.data) > self._spill_max_bytes:
+            return None
+        return self._spill_dir / f"{key.replace('/', '_')}.{next(self._spill_ids)}.tile"
+
+    def _add_spilled(
+        self, key: str, tile: _MemoryTile, path: Path, data: mmap.mmap
+    ) -> None:
+        """Serve a tile from its memory-mapped file."""
+        if key in self._memory or key in self._spilled:
+            # The tile was stored again while its file was written.
+            data.close()
+            path.unlink(missing_ok=True)
+            return
+        self._spilled[key] = _SpilledTile(path, data, tile.expires_at)
+        self._spilled_bytes += len(tile.data)
+        while (
+            self._spill_max_bytes is not None
+            and self._spilled_bytes > self._spill_max_bytes
+        ):
+            self._remove_spilled(next(iter(self._spilled)))
+
+    def _remove_memory(self, key: str) -> None:
+        """Drop a tile from memory."""
+        if (tile := self._memory.pop(key, None)) is not None:
+            self._memory_bytes -= len(tile.data)
+
+    def _remove_spilled(self, key: str) -> None:
+        """Drop a spilled tile and delete its file."""
+        if (tile := self._spilled.pop(key, None)) is None:
+            return
+        self._spilled_bytes -= len(tile.data)
+        # If a caller still holds a memoryview, the mapping is released when
+        # that view is garbage collected.
+        with contextlib.suppress(BufferError):
+            tile.data.close()
+        tile.path.unlink(missing_ok=True)
@@ -0,0 +1,85 @@
+"""Optional OpenTelemetry tracing of Google Air Quality API calls.
+
+Spans are created with the OpenTelemetry API when it is installed, and
+exported by whatever tracer provider the application configures. Without
+it, span() returns a shared no-op span.
+"""
+
+import importlib
+from contextlib import AbstractContextManager
+from types import ModuleType, TracebackType
+from typing import Any, Protocol, Self
+
+_trace: ModuleType | None
+try:
+    _trace = importlib.import_module("opentelemetry.trace")
+except ImportError:
+    _trace = None
+
+TRACER_NAME = "google_air_quality_api"
+
+CURRENT_CONDITIONS_SPAN = "google_air_quality.current_conditions"
+FORECAST_SPAN = "google_air_quality.forecast"
+REQUEST_SPAN = "google_air_quality.request"
+NETWORK_SPAN = "google_air_quality.network"
+READ_BODY_SPAN = "google_air_quality.read_body"
+DESERIALIZE_SPAN = "google_air_quality.deserialize"
+
+ENDPOINT_ATTRIBUTE = "air_quality.endpoint"
+REGION_CODE_ATTRIBUTE = "air_quality.region_code"
+LAQI_ATTRIBUTE = "air_quality.laqi"
+METHOD_ATTRIBUTE = "http.request.method"
+STATUS_ATTRIBUTE = "http.response.status_code"
+
+
+class Span(Protocol):
+    """The part of the OpenTelemetry span interface used by this library."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute."""
+
+    def is_recording(self) -> bool:
+        """Return whether attributes are recorded."""
+
+
+class NoOpSpan:
+    """A span that records nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> Self:
+        """Enter the span."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Exit the span."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Ignore an attribute."""
+
+    def is_recording(self) -> bool:
+        """Return False, nothing is recorded."""
+        return False
+
+
+NOOP_SPAN = NoOpSpan()
+TRACING_AVAILABLE = _trace is not None
+# A proxy tracer that follows the tracer provider configured later on.
+_TRACER = None if _trace is None else _trace.get_tracer(TRACER_NAME)
+
+
+def span(name: str, *, client: bool = False) -> AbstractContextManager[Span]:
+    """Return a context manager of a span, current while it is entered.
+
+    Set client for spans covering a call to the API server. Callers should
+    only compute attributes when the span is recording.
+    """
+    if _TRACER is None or _trace is None:
+        return NOOP_SPAN
+    kind = _trace.SpanKind.CLIENT if client else _trace.SpanKind.INTERNAL
+    return _TRACER.start_as_current_span(name, kind=kind)
@@ -1,7 +1,9 @@
 """Libraries used in tests."""
 
+import asyncio
 import json
-from collections.abc import Awaitable, Callable
+import threading
+from collections.abc import Awaitable, Callable, Iterator
 from pathlib import Path
 from typing import Any
 
@@ -10,15 +12,29 @@ from aiohttp import ClientSession, web
 from aiohttp.web import Application
 
 from google_air_quality_api.auth import Auth
+from google_air_quality_api.grid import BoundingBox
+from google_air_quality_api.testing import AirQualityEmulator
 
 PATH_PREFIX = "/path-prefix"
 
 AuthCallback = Callable[
-    [list[tuple[str, Callable[[web.Request], Awaitable[web.Response]]]]],
+    ...,
     Awaitable[Auth],
 ]
 
 
+class FakeClock:
+    """Controllable clock for expiry tests."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        """Initialize the clock."""
+        self.now = now
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
 def load_fixture_json(filename: str) -> Any:
     """Load a fixture and return json."""
     path = Path(__package__) / "fixtures" / filename
@@ -45,6 +61,7 @@ def mock_auth_fixture(
 
     async def create_auth(
         handlers: list[tuple[str, Callable[[web.Request], Awaitable[web.Response]]]],
+        **kwargs: Any,
     ) -> Auth:
         """Create a test authentication library with the specified handler."""
         app = Application()
@@ -54,6 +71,21 @@ def mock_auth_fixture(
 
         client = await aiohttp_client(app)
 
-        return Auth(client, api_key="dummy-key", host=PATH_PREFIX)
+        return Auth(client, api_key="dummy-key", host=PATH_PREFIX, **kwargs)
 
     return create_auth
+
+
+@pytest.fixture(name="emulator")
+def mock_emulator() -> Iterator[tuple[AirQualityEmulator, str]]:
+    """Serve an emulator from its own event loop thread."""
+    emulator = AirQualityEmulator(no_data_regions=[BoundingBox(0, 0, 10, 10)])
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    host = asyncio.run_coroutine_threadsafe(emulator.async_start(), loop).result()
+    yield emulator, host
+    asyncio.run_coroutine_threadsafe(emulator.async_stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
@@ -1,13 +1,24 @@
 """Tests for Google Air Quality library API."""
 
-from datetime import timedelta
+import asyncio
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import pytest
 from aiohttp import web
 
-from google_air_quality_api.api import GoogleAirQualityApi
-from google_air_quality_api.exceptions import InvalidCustomLAQIConfigurationError
+from google_air_quality_api.api import (
+    LEAN_PROFILE,
+    CurrentConditionsRequest,
+    GoogleAirQualityApi,
+    Period,
+    RequestProfile,
+)
+from google_air_quality_api.exceptions import (
+    InvalidCustomLAQIConfigurationError,
+    NoDataForLocationError,
+)
+from google_air_quality_api.model import AirQualityCurrentConditionsData
 
 from .conftest import AuthCallback
 
@@ -69,8 +80,296 @@ async def test_async_get_current_conditions_data(
         await api.async_get_current_conditions(1, 2, "DE")
 
 
+async def test_custom_local_aqis(
+    auth_cb: AuthCallback,
+    air_quality_current_conditions_data: dict[str, Any],
+) -> None:
+    """Test several custom local AQIs are sent in one request."""
+    payloads: list[dict[str, Any]] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        payloads.append(await request.json())
+        return web.json_response(air_quality_current_conditions_data)
+
+    auth = await auth_cb([("/currentConditions:lookup", handler)])
+    api = GoogleAirQualityApi(auth)
+
+    result = await api.async_get_current_conditions(
+        48.58, 7.75, "de", "deu_uba", {"fr": "fra_atmo", "pl": "eaqi"}
+    )
+    assert payloads[-1]["customLocalAqis"] == [
+        {"regionCode": "de", "aqi": "deu_uba"},
+        {"regionCode": "fr", "aqi": "fra_atmo"},
+        {"regionCode": "pl", "aqi": "eaqi"},
+    ]
+    assert result.indexes.deu_uba is result.indexes.laqi
+
+    with pytest.raises(InvalidCustomLAQIConfigurationError, match="unknown"):
+        await api.async_get_current_conditions(
+            1, 2, custom_local_aqis={"de": "unknown"}
+        )
+    with pytest.raises(InvalidCustomLAQIConfigurationError, match="uaqi"):
+        await api.async_get_current_conditions(1, 2, "de", "uaqi")
+    assert len(payloads) == 1
+
+
 async def test_async_get_forecast(api: GoogleAirQualityApi) -> None:
     """Test forecast lookup API."""
     result = await api.async_get_forecast(1.0, 2.0, timedelta(hours=1))
 
     assert result is not None
+
+
+async def test_request_profile(
+    auth_cb: AuthCallback,
+    air_quality_current_conditions_data: dict[str, Any],
+) -> None:
+    """Test request profiles set per call or as the client default."""
+    payloads: list[dict[str, Any]] = []
+    lean_response = {
+        "dateTime": air_quality_current_conditions_data["dateTime"],
+        "indexes": air_quality_current_conditions_data["indexes"][:1],
+    }
+
+    async def handler(request: web.Request) -> web.Response:
+        payloads.append(await request.json())
+        if request.path.endswith("forecast:lookup"):
+            return web.json_response({"hourlyForecasts": [lean_response]})
+        return web.json_response(lean_response)
+
+    auth = await auth_cb(
+        [("/currentConditions:lookup", handler), ("/forecast:lookup", handler)]
+    )
+    api = GoogleAirQualityApi(auth, profile=LEAN_PROFILE)
+
+    result = await api.async_get_current_conditions(1, 2)
+    assert payloads[-1] == {
+        "location": {"latitude": 1, "longitude": 2},
+        "universalAqi": True,
+    }
+    assert result.region_code is None
+    assert result.pollutants == []
+    assert result.indexes.uaqi is not None
+    assert result.indexes.laqi is None
+
+    profile = RequestProfile(
+        extra_computations=("LOCAL_AQI",),
+        universal_aqi=False,
+        language_code="de",
+        uaqi_color_palette="INDIGO_PERSIAN_DARK",
+    )
+    await api.async_get_current_conditions(1, 2, "DE", "deu_uba", profile=profile)
+    assert payloads[-1] == {
+        "location": {"latitude": 1, "longitude": 2},
+        "extraComputations": ["LOCAL_AQI"],
+        "universalAqi": False,
+        "languageCode": "de",
+        "uaqiColorPalette": "INDIGO_PERSIAN_DARK",
+        "customLocalAqis": [{"regionCode": "DE", "aqi": "deu_uba"}],
+    }
+
+    forecast = await GoogleAirQualityApi(auth).async_get_forecast(
+        1, 2, timedelta(hours=1)
+    )
+    assert forecast.region_code is None
+    assert payloads[-1]["extraComputations"] == ["LOCAL_AQI", "POLLUTANT_CONCENTRATION"]
+
+
+async def test_async_get_current_conditions_batch(
+    auth_cb: AuthCallback,
+    air_quality_current_conditions_data: dict[str, Any],
+) -> None:
+    """Test batch lookup keeps input order and respects the concurrency cap."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal in_flight, max_in_flight
+        body = await request.json()
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01 * (10 - body["location"]["latitude"]))
+        in_flight -= 1
+        if body["location"]["latitude"] == 3:
+            return web.json_response(
+                {
+                    "error": {
+                        "code": 400,
+                        "message": "Information is unavailable for this location.",
+                        "status": "INVALID_ARGUMENT",
+                    }
+                },
+                status=400,
+            )
+        return web.json_response(air_quality_current_conditions_data)
+
+    auth = await auth_cb([("/currentConditions:lookup", handler)])
+    api = GoogleAirQualityApi(auth)
+
+    requests = [CurrentConditionsRequest(lat, 2) for lat in range(6)]
+    requests.append((1, 2, "DE"))
+    results = await api.async_get_current_conditions_batch(requests, max_concurrency=2)
+
+    assert len(results) == 7
+    assert max_in_flight == 2
+    assert isinstance(results[3], NoDataForLocationError)
+    assert isinstance(results[6], InvalidCustomLAQIConfigurationError)
+    assert all(
+        isinstance(result, AirQualityCurrentConditionsData)
+        for index, result in enumerate(results)
+        if index not in (3, 6)
+    )
+
+    completed = [
+        index
+        async for index, _ in api.async_iter_current_conditions(
+            [(lat, 2) for lat in range(3)], max_concurrency=3
+        )
+    ]
+    assert completed == [2, 1, 0]
+
+    with pytest.raises(ValueError, match="max_concurrency"):
+        await api.async_get_current_conditions_batch([], max_concurrency=0)
+
+
+async def test_async_iter_forecast(
+    auth_cb: AuthCallback,
+    air_quality_forecast_data: dict[str, Any],
+) -> None:
+    """Test the forecast horizon is paged through with pageToken."""
+    bodies: list[dict[str, Any]] = []
+    hour = air_quality_forecast_data["hourlyForecasts"][0]
+    start = datetime(2025, 12, 8, 7, tzinfo=UTC)
+    hours = [
+        {**hour, "dateTime": (start + timedelta(hours=offset)).isoformat()}
+        for offset in range(5)
+    ]
+
+    async def handler(request: web.Request) -> web.Response:
+        body = await request.json()
+        bodies.append(body)
+        offset = int(body.get("pageToken", 0))
+        end = offset + body["pageSize"]
+        page: dict[str, Any] = {
+            "hourlyForecasts": hours[offset:end],
+            "regionCode": "de",
+        }
+        if end < len(hours):
+            page["nextPageToken"] = str(end)
+        return web.json_response(page)
+
+    auth = await auth_cb([("/forecast:lookup", handler)])
+    api = GoogleAirQualityApi(auth)
+
+    period = Period(start, start + timedelta(hours=5))
+    forecasts = [
+        forecast
+        async for forecast in api.async_iter_forecast(1, 2, period, page_size=2)
+    ]
+    assert [forecast.date_time for forecast in forecasts] == [
+        start + timedelta(hours=offset) for offset in range(5)
+    ]
+    assert len(bodies) == 3
+    assert bodies[0]["period"] == {
+        "startTime": "2025-12-08T07:00:00+00:00",
+        "endTime": "2025-12-08T12:00:00+00:00",
+    }
+    assert [body.get("pageToken") for body in bodies] == [None, "2", "4"]
+
+    bodies.clear()
+    forecast = await api.async_get_lazy_forecast(1, 2, period, page_size=2)
+    assert len(bodies) == 3
+    assert len(forecast.hourly_forecasts) == 5
+    assert forecast.hourly_forecasts.loaded == 0
+    assert forecast.hourly_forecasts[4].date_time == start + timedelta(hours=4)
+    assert forecast.region_code == "de"
+
+    bodies.clear()
+    async for _ in api.async_iter_forecast(1, 2):
+        break
+    assert len(bodies) == 1
+    assert bodies[0]["pageSize"] == 96
+    default_period = bodies[0]["period"]
+    end_time = datetime.fromisoformat(default_period["endTime"])
+    assert end_time - datetime.fromisoformat(default_period["startTime"]) == timedelta(
+        hours=95
+    )
+    assert end_time <= datetime.now(tz=UTC) + timedelta(hours=96)
+
+
+async def test_async_history(
+    auth_cb: AuthCallback,
+    air_quality_current_conditions_data: dict[str, Any],
+) -> None:
+    """Test history lookups in windows and pages."""
+    bodies: list[dict[str, Any]] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        body = await request.json()
+        bodies.append(body)
+        start = datetime.fromisoformat(body["period"]["startTime"])
+        end = datetime.fromisoformat(body["period"]["endTime"])
+        hours = [
+            {**air_quality_current_conditions_data, "dateTime": hour.isoformat()}
+            for hour in (
+                start + timedelta(hours=offset)
+                for offset in range(int((end - start) / timedelta(hours=1)))
+            )
+        ]
+        # Return at most two records per page.
+        offset = int(body.get("pageToken", 0))
+        page: dict[str, Any] = {"hoursInfo": hours[offset : offset + 2]}
+        if offset + 2 < len(hours):
+            page["nextPageToken"] = str(offset + 2)
+        return web.json_response(page)
+
+    auth = await auth_cb([("/history:lookup", handler)])
+    api = GoogleAirQualityApi(auth)
+    start = datetime(2025, 12, 1, tzinfo=UTC)
+    period = Period(start, start + timedelta(hours=10))
+
+    history = await api.async_get_history(1, 2, period=period)
+    assert len(history.hours_info) == 10
+    assert len(bodies) == 5
+
+    bodies.clear()
+    hours = [
+        hour.date_time
+        async for hour in api.async_iter_history(
+            1, 2, period=period, page_size=3, prefetch=3
+        )
+    ]
+    assert hours == [start + timedelta(hours=offset) for offset in range(10)]
+    assert sorted(
+        body["period"]["startTime"] for body in bodies if "pageToken" not in body
+    ) == [(start + timedelta(hours=offset)).isoformat() for offset in (0, 3, 6, 9)]
+
+    bodies.clear()
+    history = await api.async_get_history(1, 2, hours=4)
+    assert len(history.hours_info) == 4
+
+    bodies.clear()
+    with pytest.raises(ValueError, match="hours or period"):
+        await api.async_get_history(1, 2)
+    with pytest.raises(ValueError, match="720 hours"):
+        await api.async_get_history(1, 2, hours=721)
+    with pytest.raises(ValueError, match="720 hours"):
+        await anext(
+            api.async_iter_history(
+                1, 2, period=Period(start, start + timedelta(days=31))
+            )
+        )
+    assert not bodies
+    with pytest.raises(ValueError, match="hours or period"):
+        await api.async_get_history(1, 2, hours=1, period=period)
+    with pytest.raises(ValueError, match="prefetch"):
+        async for _ in api.async_iter_history(1, 2, hours=1, prefetch=0):
+            pass
+    for page_size in (0, -1):
+        with pytest.raises(ValueError, match="page_size"):
+            await anext(api.async_iter_history(1, 2, hours=1, page_size=page_size))
+    with pytest.raises(ValueError, match="end after it starts"):
+        await api.async_get_history(1, 2, hours=0)
+    with pytest.raises(ValueError, match="end after it starts"):
+        await api.async_get_history(1, 2, period=Period(start, start))
+    assert not bodies
@@ -1,14 +1,23 @@
 """Tests for the request client library."""
 
+import asyncio
+import logging
 import re
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 
 import pytest
 from aiohttp import web
+from aiohttp.test_utils import TestServer
 from mashumaro import field_options
 from mashumaro.mixins.json import DataClassJSONMixin
 
-from google_air_quality_api.auth import UNSUPPORTED_LAQI_ERROR, Auth
+from google_air_quality_api.auth import (
+    ACCEPT_ENCODING,
+    UNSUPPORTED_LAQI_ERROR,
+    Auth,
+    ConnectionStats,
+)
 from google_air_quality_api.exceptions import (
     ApiError,
     ApiForbiddenError,
@@ -105,6 +114,26 @@ async def test_post_json_response(auth_cb: AuthCallback) -> None:
     assert data == Response(some_key="some-value")
 
 
+async def test_post_json_response_logging(
+    auth_cb: AuthCallback, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test the response body is only logged with debug logging enabled."""
+
+    async def handler(_: web.Request) -> web.Response:
+        return web.json_response({"some-key": "some-välue"})
+
+    auth = await auth_cb([("/some-path", handler)])
+
+    with caplog.at_level(logging.INFO):
+        data = await auth.post_json("some-path", data_cls=Response)
+    assert data == Response(some_key="some-välue")
+    assert "response=" not in caplog.text
+
+    with caplog.at_level(logging.DEBUG):
+        await auth.post_json("some-path", data_cls=Response)
+    assert "response={" in caplog.text
+
+
 async def test_post_json_response_unexpected(auth_cb: AuthCallback) -> None:
     """Test post that returns wrong json type."""
 
@@ -301,3 +330,105 @@ async def test_custom_laqui_error(auth_cb: AuthCallback) -> None:
         ),
     ):
         await auth.get_json("some-path", data_cls=Response)
+
+
+async def test_coalesce_requests(auth_cb: AuthCallback) -> None:
+    """Test concurrent identical requests share one underlying request."""
+    requests: list[web.Request] = []
+    release = asyncio.Event()
+
+    async def handler(request: web.Request) -> web.Response:
+        requests.append(request)
+        await release.wait()
+        if (await request.json())["fail"]:
+            return web.Response(status=500)
+        return web.json_response({"some-key": "some-value"})
+
+    auth = await auth_cb([("/some-path", handler)], coalesce_requests=True)
+
+    calls = [
+        asyncio.create_task(
+            auth.post_json("some-path", json={"fail": False}, data_cls=Response)
+        )
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0.05)
+    calls[0].cancel()
+    release.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1] is results[2]
+    assert results[1] == Response(some_key="some-value")
+    assert len(requests) == 1
+
+    calls = [
+        auth.post_json("some-path", json={"fail": True}, data_cls=Response)
+        for _ in range(2)
+    ]
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    assert all(isinstance(result, ApiError) for result in results)
+    assert len(requests) == 2
+
+    await auth.post_json("some-path", json={"fail": False}, data_cls=Response)
+    assert len(requests) == 3
+
+
+async def test_coalesce_requests_cancelled(auth_cb: AuthCallback) -> None:
+    """Test a coalesced request is cancelled when every caller is."""
+    cancelled = asyncio.Event()
+
+    async def handler(_: web.Request) -> web.Response:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return web.json_response({"some-key": "some-value"})
+
+    auth = await auth_cb([("/some-path", handler)], coalesce_requests=True)
+
+    calls = [
+        asyncio.create_task(
+            auth.post_json("some-path", json={"fail": False}, data_cls=Response)
+        )
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0.05)
+    calls[0].cancel()
+    await asyncio.sleep(0.05)
+    assert not cancelled.is_set()
+    assert not calls[1].done()
+    calls[1].cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.gather(*calls, return_exceptions=True)
+    assert not auth._in_flight  # noqa: SLF001
+
+
+async def test_create(aiohttp_server: Callable[..., Awaitable[TestServer]]) -> None:
+    """Test the tuned session of Auth.create and its connection stats."""
+    headers: list[str] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        headers.append(request.headers["Accept-Encoding"])
+        return web.json_response({"some-key": "some-value"})
+
+    async def warm_up_handler(_: web.Request) -> web.Response:
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post("/v1/some-path", handler)
+    app.router.add_get("/v1", warm_up_handler)
+    server = await aiohttp_server(app)
+
+    async with Auth.create(
+        "dummy-key", host=str(server.make_url("/v1")), limit_per_host=4, warm_up=3
+    ) as auth:
+        stats = auth.connection_stats()
+        assert stats == ConnectionStats(limit=100, limit_per_host=4, in_use=0, idle=3)
+        result = await auth.post_json("some-path", Response)
+        assert result.some_key == "some-value"
+        assert auth.connection_stats().idle == 3
+        session = auth._websession  # noqa: SLF001
+    assert session.closed
+    assert headers == [ACCEPT_ENCODING]
+    assert ACCEPT_ENCODING.startswith("gzip")
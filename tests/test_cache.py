@@ -0,0 +1,133 @@
+"""Tests for the response cache."""
+
+from typing import Any
+
+import pytest
+from aiohttp import web
+
+from google_air_quality_api import geohash
+from google_air_quality_api.api import GoogleAirQualityApi
+from google_air_quality_api.cache import ResponseCache, normalize_payload
+
+from .conftest import AuthCallback, FakeClock
+
+
+def test_normalize_payload() -> None:
+    """Test equivalent payloads normalize to the same key."""
+    first = {
+        "location": {"latitude": 48.1234567, "longitude": 11.5},
+        "extraComputations": ["POLLUTANT_CONCENTRATION", "LOCAL_AQI"],
+        "dateTime": "2025-12-08T07:12:00+00:00",
+    }
+    second = {
+        "dateTime": "2025-12-08T07:48:31+00:00",
+        "extraComputations": ["LOCAL_AQI", "POLLUTANT_CONCENTRATION"],
+        "location": {"latitude": 48.12345671, "longitude": 11.5},
+    }
+    assert normalize_payload(first) == normalize_payload(second)
+    assert normalize_payload(first) != normalize_payload(
+        {**first, "dateTime": "2025-12-08T08:00:00+00:00"}
+    )
+
+
+def test_expiry_and_eviction() -> None:
+    """Test TTL expiry, hour alignment and LRU eviction."""
+    clock = FakeClock(7200.0)
+    cache = ResponseCache(
+        ttls={"a": 60, "b": 0}, max_entries=2, max_bytes=100, clock=clock
+    )
+
+    cache.set("a", "k1", "v1", 10)
+    cache.set("b", "k2", "v2", 10)
+    assert len(cache) == 1
+    assert cache.get("k1") == "v1"
+
+    clock.now += 61
+    assert cache.get("k1") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+    cache.set("a", "k1", "v1", 10)
+    cache.set("a", "k2", "v2", 10)
+    cache.get("k1")
+    cache.set("a", "k3", "v3", 10)
+    assert cache.get("k2") is None
+    assert cache.get("k1") == "v1"
+
+    cache.set("a", "k4", "v4", 90)
+    assert len(cache) == 2
+    assert cache.size_bytes == 100
+    cache.set("a", "k5", "v5", 101)
+    assert cache.get("k5") is None
+    assert cache.stats.evictions == 2
+
+    clock.now = 3600 * 5 - 1
+    cache.set("a", "k1", "v1", 10)
+    clock.now += 1
+    assert cache.get("k1") is None
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+
+
+async def test_cached_lookups(
+    auth_cb: AuthCallback,
+    air_quality_current_conditions_data: dict[str, Any],
+) -> None:
+    """Test repeated lookups are served from the cache."""
+    requests: list[web.Request] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requests.append(request)
+        return web.json_response(air_quality_current_conditions_data)
+
+    cache = ResponseCache()
+    auth = await auth_cb([("/currentConditions:lookup", handler)], cache=cache)
+    api = GoogleAirQualityApi(auth)
+
+    first = await api.async_get_current_conditions(1, 2)
+    second = await api.async_get_current_conditions(1, 2)
+    assert second is first
+    assert len(requests) == 1
+    assert cache.stats.hits == 1
+
+    await api.async_get_current_conditions(1, 3)
+    assert len(requests) == 2
+    assert cache.stats.hit_ratio == 1 / 3
+
+
+def test_geohash() -> None:
+    """Test geohash encoding against a known cell."""
+    assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    lat, lon = geohash.decode("u4pruydqqvj")
+    assert lat == pytest.approx(57.64911, abs=1e-5)
+    assert lon == pytest.approx(10.40744, abs=1e-5)
+    with pytest.raises(ValueError, match="precision"):
+        geohash.encode(0, 0, 13)
+    with pytest.raises(ValueError, match="precision"):
+        ResponseCache(geohash_precision=0)
+
+
+async def test_geohash_cache(
+    auth_cb: AuthCallback,
+    air_quality_current_conditions_data: dict[str, Any],
+) -> None:
+    """Test nearby lookups are served from the same geohash cell."""
+    requests: list[web.Request] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requests.append(request)
+        return web.json_response(air_quality_current_conditions_data)
+
+    cache = ResponseCache(geohash_precision=6)
+    assert cache.geohash_precision == 6
+    auth = await auth_cb([("/currentConditions:lookup", handler)], cache=cache)
+    api = GoogleAirQualityApi(auth)
+
+    first = await api.async_get_current_conditions(48.137154, 11.576124)
+    assert await api.async_get_current_conditions(48.1372, 11.5762) is first
+    assert len(requests) == 1
+    await api.async_get_current_conditions(48.2, 11.6)
+    assert len(requests) == 2
+    assert cache.stats.hit_ratio == 1 / 3
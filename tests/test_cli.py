@@ -0,0 +1,156 @@
+"""Tests for the command line interface."""
+
+import csv
+import json
+import multiprocessing
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from google_air_quality_api.cli import API_KEY_ENV, main, read_locations
+from google_air_quality_api.testing import AirQualityEmulator
+
+LOCATIONS = """\
+# Locations to look up
+lat,lon,region_code,custom_local_aqi
+52.52,13.40
+48.14,11.58,de,deu_uba
+5.0,5.0
+50.94,6.96
+53.55,9.99
+52.0
+52.0,east
+"""
+
+
+@pytest.fixture(name="locations")
+def mock_locations(tmp_path: Path) -> Path:
+    """Return a file of locations, one without data and two invalid."""
+    path = tmp_path / "locations.csv"
+    path.write_text(LOCATIONS, encoding="utf-8")
+    return path
+
+
+def test_read_locations(locations: Path) -> None:
+    """Test locations are split between shards by index."""
+    shards = [list(read_locations(locations, shard, 2)) for shard in range(2)]
+
+    assert [index for index, _ in shards[0]] == [0, 2, 4, 6]
+    assert [index for index, _ in shards[1]] == [1, 3, 5]
+    _, request = shards[1][0]
+    assert (request.lat, request.lon, request.region_code) == (48.14, 11.58, "de")
+    assert request.custom_local_aqi == "deu_uba"
+    assert shards[1][1][1].region_code is None
+    assert shards[1][2][1] == "Invalid location: 52.0"
+    assert shards[0][3][1] == "Invalid location: 52.0,east"
+
+
+def test_bulk_ndjson(
+    emulator: tuple[AirQualityEmulator, str], locations: Path, tmp_path: Path
+) -> None:
+    """Test every location is written once by the workers."""
+    server, host = emulator
+    output = tmp_path / "results.ndjson"
+
+    code = main(
+        [
+            "bulk",
+            str(locations),
+            "--workers",
+            "2",
+            "--host",
+            host,
+            "--api-key",
+            "dummy-key",
+            "--output",
+            str(output),
+        ]
+    )
+
+    assert code == 0
+    rows = {
+        row["index"]: row
+        for row in map(json.loads, output.read_text(encoding="utf-8").splitlines())
+    }
+    assert sorted(rows) == [0, 1, 2, 3, 4, 5, 6]
+    assert sorted(index for index, row in rows.items() if "error" in row) == [2, 5, 6]
+    assert rows[0]["uaqi"] is not None
+    assert rows[0]["laqi_code"] == "deu_uba"
+    assert rows[0]["pollutants"]
+    assert server.stats.requests["currentConditions"] == 5
+
+
+def test_bulk_csv(
+    emulator: tuple[AirQualityEmulator, str],
+    locations: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test lean lookups written as CSV."""
+    _, host = emulator
+    output = tmp_path / "results.csv"
+    monkeypatch.setenv(API_KEY_ENV, "dummy-key")
+
+    code = main(
+        [
+            "bulk",
+            str(locations),
+            "--workers",
+            "1",
+            "--host",
+            host,
+            "--format",
+            "csv",
+            "--lean",
+            "--output",
+            str(output),
+        ]
+    )
+
+    assert code == 0
+    with output.open(newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    rows.sort(key=lambda row: int(row["index"]))
+    assert [row["index"] for row in rows] == ["0", "1", "2", "3", "4", "5", "6"]
+    assert rows[0]["uaqi"]
+    assert not rows[0]["laqi_code"]
+    assert rows[2]["error"]
+
+
+def test_bulk_killed_worker(
+    locations: Path, tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    """Test a worker that dies without reporting fails the command."""
+    # The server never accepts, so every lookup waits for its response.
+    with (
+        socket.create_server(("127.0.0.1", 0)) as server,
+        ThreadPoolExecutor(max_workers=1) as executor,
+    ):
+        host = "http://{}:{}/v1".format(*server.getsockname())
+        args = ["bulk", str(locations), "--workers", "1", "--host", host]
+        args += ["--api-key", "dummy-key", "--output", str(tmp_path / "out")]
+        future = executor.submit(main, args)
+        deadline = time.monotonic() + 10
+        while not (children := multiprocessing.active_children()):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        for child in children:
+            child.kill()
+
+        assert future.result(timeout=10) == 1
+    assert "worker 0 exited with code" in capsys.readouterr().err
+
+
+def test_missing_api_key(
+    locations: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+) -> None:
+    """Test an API key is required."""
+    monkeypatch.delenv(API_KEY_ENV, raising=False)
+
+    with pytest.raises(SystemExit):
+        main(["bulk", str(locations)])
+
+    assert API_KEY_ENV in capsys.readouterr().err
@@ -0,0 +1,98 @@
+"""Tests for the columnar view of hourly records."""
+
+import copy
+import math
+from datetime import datetime
+
+import pytest
+
+from google_air_quality_api.columns import AirQualityColumns
+from google_air_quality_api.model import (
+    AirQualityCurrentConditionsData,
+    AirQualityForecastData,
+    AirQualityHistoryData,
+)
+
+
+def test_forecast_to_columns(air_quality_forecast_data: dict) -> None:
+    """Test columns are aligned by hour and padded with NaN."""
+    first = air_quality_forecast_data["hourlyForecasts"][0]
+    second = copy.deepcopy(first)
+    second["dateTime"] = "2025-12-08T08:00:00Z"
+    second["pollutants"] = [
+        pollutant for pollutant in second["pollutants"] if pollutant["code"] != "co"
+    ]
+    third = copy.deepcopy(first)
+    third["dateTime"] = "2025-12-08T09:00:00Z"
+    third["pollutants"].append(
+        {
+            "code": "nh3",
+            "displayName": "NH3",
+            "fullName": "Ammonia",
+            "concentration": {"value": 1.5, "units": "PARTS_PER_BILLION"},
+        }
+    )
+    data = AirQualityForecastData.from_dict(
+        {**air_quality_forecast_data, "hourlyForecasts": [first, second, third]}
+    )
+
+    columns = data.to_columns()
+
+    assert len(columns) == 3
+    assert (
+        columns.timestamps[0] == datetime.fromisoformat(first["dateTime"]).timestamp()
+    )
+    co = columns.concentrations["co"]
+    assert co[0] == first["pollutants"][0]["concentration"]["value"]
+    assert math.isnan(co[1])
+    nh3 = columns.concentrations["nh3"]
+    assert math.isnan(nh3[0])
+    assert math.isnan(nh3[1])
+    assert nh3[2] == 1.5
+    assert columns.units["nh3"] == "ppb"
+    assert list(columns.aqi["uaqi"]) == [80, 80, 80]
+    assert all(math.isnan(value) for value in columns.aqi["deu_uba"])
+    assert all(len(values) == 3 for values in columns.concentrations.values())
+
+
+def test_empty_columns() -> None:
+    """Test columns of a response without records."""
+    columns = AirQualityHistoryData().to_columns()
+    assert len(columns) == 0
+    assert columns.concentrations == {}
+
+
+def test_to_numpy(air_quality_forecast_data: dict) -> None:
+    """Test the NumPy export."""
+    np = pytest.importorskip("numpy")
+    columns = AirQualityForecastData.from_dict(air_quality_forecast_data).to_columns()
+    arrays = columns.to_numpy()
+    assert arrays["timestamp"].dtype == np.float64
+    assert arrays["aqi_uaqi"].tolist() == [80.0]
+    assert set(arrays) >= {"concentration_pm25", "aqi_deu_uba"}
+
+
+def test_from_hours_generator(air_quality_current_conditions_data: dict) -> None:
+    """Test columns can be built from any iterable, e.g. a history stream."""
+    hour = AirQualityCurrentConditionsData.from_dict(
+        air_quality_current_conditions_data
+    )
+    columns = AirQualityColumns.from_hours(hour for _ in range(4))
+    assert len(columns) == 4
+
+
+def test_from_hours_duplicate_codes(air_quality_current_conditions_data: dict) -> None:
+    """Test a code repeated within an hour keeps the columns aligned."""
+    data = copy.deepcopy(air_quality_current_conditions_data)
+    co = next(p for p in data["pollutants"] if p["code"] == "co")
+    data["pollutants"].append(
+        {**co, "concentration": {**co["concentration"], "value": 1.0}}
+    )
+    data["indexes"].append(data["indexes"][0])
+    hour = AirQualityCurrentConditionsData.from_dict(data)
+
+    columns = AirQualityColumns.from_hours([hour, hour, hour])
+
+    assert len(columns.concentrations["co"]) == len(columns.timestamps) == 3
+    assert columns.concentrations["co"].tolist() == [1.0, 1.0, 1.0]
+    assert all(len(values) == 3 for values in columns.aqi.values())
@@ -0,0 +1,92 @@
+"""Tests for the grid sampler."""
+
+import math
+from typing import Any
+
+import pytest
+from aiohttp import web
+
+from google_air_quality_api.api import GoogleAirQualityApi
+from google_air_quality_api.exceptions import ApiError
+from google_air_quality_api.grid import BoundingBox, async_sample_grid
+
+from .conftest import AuthCallback
+
+NO_DATA = {
+    "error": {
+        "code": 400,
+        "message": "Information is unavailable for this location.",
+        "status": "INVALID_ARGUMENT",
+    }
+}
+
+
+@pytest.fixture(name="grid_api")
+async def mock_grid_api(
+    auth_cb: AuthCallback,
+    air_quality_current_conditions_data: dict[str, Any],
+) -> tuple[GoogleAirQualityApi, list[dict[str, Any]]]:
+    """Return an API without data north of 0.01 degrees."""
+    bodies: list[dict[str, Any]] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        body = await request.json()
+        bodies.append(body)
+        if body["location"]["latitude"] >= 0.01:
+            return web.json_response(NO_DATA, status=400)
+        if body["location"]["longitude"] >= 1:
+            return web.Response(status=500)
+        return web.json_response(air_quality_current_conditions_data)
+
+    auth = await auth_cb([("/currentConditions:lookup", handler)])
+    return GoogleAirQualityApi(auth), bodies
+
+
+async def test_async_sample_grid(
+    grid_api: tuple[GoogleAirQualityApi, list[dict[str, Any]]],
+    air_quality_current_conditions_data: dict[str, Any],
+) -> None:
+    """Test points are snapped, deduplicated and masked."""
+    api, bodies = grid_api
+
+    grid = await async_sample_grid(
+        api, BoundingBox(0, 0, 0.01, 0.004), 0.002, max_concurrency=4
+    )
+
+    assert list(grid.latitudes) == pytest.approx([0, 0.002, 0.004, 0.006, 0.008, 0.01])
+    assert len(grid.longitudes) == 3
+    # Latitudes snap to 0, 0, 0.005, 0.005, 0.01, 0.01 and longitudes to 0, 0, 0.005.
+    assert grid.requests == len(bodies) == 6
+    assert grid.mask[0] == [False, False, False]
+    assert grid.mask[5] == [True, True, True]
+
+    uaqi = air_quality_current_conditions_data["indexes"][0]["aqi"]
+    assert list(grid.uaqi[0]) == [uaqi] * 3
+    assert all(math.isnan(value) for value in grid.uaqi[5])
+    assert set(grid.concentrations) >= {"pm25", "no2"}
+    assert math.isnan(grid.concentrations["pm25"][4][0])
+
+
+async def test_async_sample_grid_errors(
+    grid_api: tuple[GoogleAirQualityApi, list[dict[str, Any]]],
+) -> None:
+    """Test invalid input and errors other than missing data."""
+    api, _ = grid_api
+    with pytest.raises(ValueError, match="spacing"):
+        await async_sample_grid(api, BoundingBox(0, 0, 1, 1), 0)
+    with pytest.raises(ValueError, match="south"):
+        await async_sample_grid(api, BoundingBox(1, 0, 0, 1), 0.1)
+    with pytest.raises(ApiError):
+        await async_sample_grid(api, BoundingBox(0, 1, 0, 1), 0.1)
+
+
+async def test_grid_to_numpy(
+    grid_api: tuple[GoogleAirQualityApi, list[dict[str, Any]]],
+) -> None:
+    """Test the NumPy export uses masked arrays."""
+    pytest.importorskip("numpy")
+    api, _ = grid_api
+    grid = await async_sample_grid(api, BoundingBox(0, 0, 0.01, 0), 0.01)
+    arrays = grid.to_numpy()
+    assert arrays["uaqi"].shape == (2, 1)
+    assert arrays["uaqi"].mask.tolist() == [[False], [True]]
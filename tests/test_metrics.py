@@ -0,0 +1,124 @@
+"""Tests for request metrics."""
+
+from collections.abc import Awaitable, Callable
+
+import pytest
+from aiohttp import ClientSession, web
+from aiohttp.web import Application
+
+from google_air_quality_api.api import GoogleAirQualityApi
+from google_air_quality_api.auth import Auth
+from google_air_quality_api.exceptions import ApiError
+from google_air_quality_api.metrics import (
+    MetricsRegistry,
+    Observation,
+    RequestMetrics,
+    endpoint_label,
+    outcome_class,
+)
+from google_air_quality_api.model import AirQualityCurrentConditionsData
+from google_air_quality_api.testing import AirQualityEmulator
+
+ClientFactory = Callable[..., Awaitable[ClientSession]]
+
+
+async def create_auth(
+    aiohttp_client: ClientFactory, app: Application, metrics: RequestMetrics
+) -> Auth:
+    """Return an Auth traced by metrics."""
+    client = await aiohttp_client(app, trace_configs=[metrics.trace_config()])
+    return Auth(client, api_key="dummy-key", host="/v1", metrics=metrics)
+
+
+async def test_registry(aiohttp_client: ClientFactory) -> None:
+    """Test every phase of a lookup is recorded."""
+    metrics = RequestMetrics()
+    auth = await create_auth(aiohttp_client, AirQualityEmulator().app(), metrics)
+    api = GoogleAirQualityApi(auth)
+
+    await api.async_get_current_conditions(52.52, 13.40)
+    await api.async_get_current_conditions(48.14, 11.58)
+
+    registry = metrics.registry
+    assert registry is not None
+    for name in (
+        "duration_seconds",
+        "ttfb_seconds",
+        "read_seconds",
+        "parse_seconds",
+        "deserialize_seconds",
+        "request_bytes",
+        "response_bytes",
+    ):
+        histogram = registry.get(name, "currentConditions:lookup")
+        assert histogram is not None, name
+        assert histogram.count == 2
+        assert histogram.sum > 0
+    connect = registry.get("connect_seconds", "currentConditions:lookup")
+    assert connect is not None
+    assert connect.count == 1
+
+
+async def test_callback_outcomes(aiohttp_client: ClientFactory) -> None:
+    """Test observations are passed to the callback with their outcome."""
+
+    async def handler(_: web.Request) -> web.Response:
+        return web.Response(status=503)
+
+    app = Application()
+    app.router.add_post("/v1/some-path", handler)
+    observations: list[Observation] = []
+    auth = await create_auth(aiohttp_client, app, RequestMetrics(observations.append))
+
+    with pytest.raises(ApiError):
+        await auth.post_json("some-path", AirQualityCurrentConditionsData, json={})
+
+    assert {(o.name, o.endpoint, o.outcome) for o in observations} == {
+        ("duration_seconds", "some-path", "server_error"),
+        ("connect_seconds", "some-path", "server_error"),
+        ("request_bytes", "some-path", "server_error"),
+        ("ttfb_seconds", "some-path", "server_error"),
+    }
+
+
+def test_prometheus_export() -> None:
+    """Test the Prometheus text exposition format."""
+    registry = MetricsRegistry()
+    registry(Observation("ttfb_seconds", "forecast:lookup", "success", 0.02))
+    registry(Observation("ttfb_seconds", "forecast:lookup", "success", 3.0))
+    registry(Observation("response_bytes", "forecast:lookup", "success", 2000))
+
+    text = registry.to_prometheus()
+    lines = text.splitlines()
+    assert "# TYPE google_air_quality_ttfb_seconds histogram" in lines
+    labels = 'endpoint="forecast:lookup",outcome="success"'
+    assert f'google_air_quality_ttfb_seconds_bucket{{{labels},le="0.01"}} 0' in lines
+    assert f'google_air_quality_ttfb_seconds_bucket{{{labels},le="0.025"}} 1' in lines
+    assert f'google_air_quality_ttfb_seconds_bucket{{{labels},le="+Inf"}} 2' in lines
+    assert f"google_air_quality_ttfb_seconds_count{{{labels}}} 2" in lines
+    assert f"google_air_quality_ttfb_seconds_sum{{{labels}}} 3.02" in lines
+    assert f'google_air_quality_response_bytes_bucket{{{labels},le="4096"}} 1' in lines
+    assert MetricsRegistry().to_prometheus() == ""
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("currentConditions:lookup", "currentConditions:lookup"),
+        ("https://host/v1/forecast:lookup?key=x", "forecast:lookup"),
+        ("mapTypes/UAQI_RED_GREEN/heatmapTiles/2/1/1", "heatmapTiles"),
+    ],
+)
+def test_endpoint_label(url: str, expected: str) -> None:
+    """Test endpoint labels."""
+    assert endpoint_label(url) == expected
+
+
+def test_outcome_class() -> None:
+    """Test outcome classes of response statuses."""
+    assert [outcome_class(status) for status in (200, 400, 429, 500)] == [
+        "success",
+        "client_error",
+        "throttled",
+        "server_error",
+    ]
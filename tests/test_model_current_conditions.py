@@ -1,5 +1,8 @@
 """Snapshot tests for Google Air Quality API client."""
 
+import pickle
+
+import pytest
 from syrupy.assertion import SnapshotAssertion
 
 from google_air_quality_api.model import (
@@ -30,3 +33,48 @@ def test_air_quality_current_conditions_snapshot(
         if cat.normalized not in seen:
             seen[cat.normalized] = cat.original
     assert dict(sorted(seen.items())) == snapshot(name="all_aqi_categories")
+
+
+def test_air_quality_current_conditions_slots(
+    air_quality_current_conditions_data: dict,
+) -> None:
+    """Test response objects are slotted and still normalize units."""
+    data = AirQualityCurrentConditionsData.from_dict(
+        air_quality_current_conditions_data
+    )
+    pollutant = data.pollutants[0]
+    for obj in (data, data.indexes[0], pollutant, pollutant.concentration):
+        assert not hasattr(obj, "__dict__")
+    assert pollutant.concentration.units in ("ppb", "µg/m³")
+
+
+def test_air_quality_current_conditions_lookups(
+    air_quality_current_conditions_data: dict,
+) -> None:
+    """Test the cached pollutant and index lookups."""
+    data = AirQualityCurrentConditionsData.from_dict(
+        air_quality_current_conditions_data
+    )
+    assert data.pollutants is data.pollutants
+    assert data.indexes is data.indexes
+
+    pm25 = data.pollutants.get("PM25")
+    assert pm25 is not None
+    assert data.pollutants.pm25 is pm25
+    assert data.pollutants.get("nh3") is None
+    with pytest.raises(AttributeError, match="No pollutant named 'nh3'"):
+        _ = data.pollutants.NH3
+
+    assert data.indexes.get("uaqi") is data.indexes.uaqi
+    assert data.indexes.laqi is not None
+    assert data.indexes.laqi.code == "deu_uba"
+    assert data.indexes.get("usa_epa") is None
+    assert data.indexes.deu_uba is data.indexes.laqi
+    assert data.indexes.laqis == [data.indexes.laqi]
+    with pytest.raises(AttributeError, match="No index named 'usa_epa'"):
+        _ = data.indexes.usa_epa
+
+    restored = pickle.loads(pickle.dumps(data))  # noqa: S301
+    assert restored == data
+    assert restored.indexes.deu_uba == data.indexes.laqi
+    assert restored.pollutants.pm25 == pm25
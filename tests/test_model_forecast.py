@@ -1,10 +1,14 @@
 """Snapshot tests for Google Air Quality API client."""
 
+import pytest
 from syrupy.assertion import SnapshotAssertion
 
+from google_air_quality_api.exceptions import ApiError
 from google_air_quality_api.model import (
     AirQualityForecastData,
     AQICategoryMapping,
+    LazyAirQualityForecastData,
+    LazyHourlyList,
 )
 
 
@@ -27,3 +31,45 @@ def test_air_quality_forecast_snapshot(
         if cat.normalized not in seen:
             seen[cat.normalized] = cat.original
     assert dict(sorted(seen.items())) == snapshot(name="all_aqi_categories")
+
+
+def test_lazy_air_quality_forecast(air_quality_forecast_data: dict) -> None:
+    """Test hourly forecasts are deserialized on access and memoized."""
+    hour = air_quality_forecast_data["hourlyForecasts"][0]
+    raw = {**air_quality_forecast_data, "hourlyForecasts": [hour] * 4}
+    eager = AirQualityForecastData.from_dict(raw)
+    lazy = LazyAirQualityForecastData.from_dict(raw)
+
+    hours = lazy.hourly_forecasts
+    assert len(hours) == 4
+    assert hours.loaded == 0
+    assert repr(hours) == "LazyHourlyList(4 hours, 0 loaded)"
+
+    assert hours[-1] == eager.hourly_forecasts[-1]
+    assert hours[-1] is hours[3]
+    assert hours.loaded == 1
+    assert hours[:2] == eager.hourly_forecasts[:2]
+    assert hours.loaded == 3
+
+    assert list(hours) == eager.hourly_forecasts
+    assert hours == eager.hourly_forecasts
+    assert hours != eager.hourly_forecasts[:1]
+    assert lazy.region_code == "de"
+    assert len(lazy.to_columns()) == 4
+
+    other = LazyHourlyList([hour])
+    hours.extend(other)
+    assert len(hours) == 5
+    assert hours[4] == eager.hourly_forecasts[0]
+
+
+def test_lazy_malformed_hour(air_quality_forecast_data: dict) -> None:
+    """Test a malformed hour raises the error of an eagerly parsed response."""
+    hour = air_quality_forecast_data["hourlyForecasts"][0]
+    malformed = {key: value for key, value in hour.items() if key != "dateTime"}
+    hours = LazyHourlyList([hour, malformed])
+
+    assert hours[0].date_time is not None
+    with pytest.raises(ApiError, match="malformed response"):
+        hours[1]
+    assert hours.loaded == 1
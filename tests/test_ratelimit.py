@@ -0,0 +1,53 @@
+"""Tests for the client-side rate limiter."""
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from google_air_quality_api.ratelimit import TokenBucket
+
+from .conftest import AuthCallback
+
+
+async def test_token_bucket() -> None:
+    """Test callers beyond the burst are queued in order."""
+    bucket = TokenBucket(requests_per_minute=1200, burst=2)
+    assert bucket.available_tokens == 2
+    order: list[int] = []
+
+    async def call(number: int) -> None:
+        await bucket.acquire()
+        order.append(number)
+
+    start = time.monotonic()
+    await asyncio.gather(*(call(number) for number in range(5)))
+    elapsed = time.monotonic() - start
+
+    assert order == [0, 1, 2, 3, 4]
+    # Three requests had to wait for a refill at 20 requests per second.
+    assert elapsed >= 0.14
+    assert bucket.waits == 3
+
+
+def test_token_bucket_validation() -> None:
+    """Test invalid configuration is rejected."""
+    with pytest.raises(ValueError, match="requests_per_minute"):
+        TokenBucket(requests_per_minute=0)
+    with pytest.raises(ValueError, match="burst"):
+        TokenBucket(requests_per_minute=60, burst=0)
+    assert TokenBucket(requests_per_minute=6000).available_tokens == 100
+
+
+async def test_rate_limited_auth(auth_cb: AuthCallback) -> None:
+    """Test requests made through Auth take tokens."""
+
+    async def handler(_: web.Request) -> web.Response:
+        return web.json_response({})
+
+    bucket = TokenBucket(requests_per_minute=60, burst=3)
+    auth = await auth_cb([("/some-path", handler)], rate_limiter=bucket)
+    await auth.get("some-path")
+    await auth.post("some-path")
+    assert bucket.available_tokens == pytest.approx(1, abs=0.1)
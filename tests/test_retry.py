@@ -0,0 +1,114 @@
+"""Tests for retrying transient failures."""
+
+import pytest
+from aiohttp import web
+
+from google_air_quality_api.exceptions import ApiError, ApiForbiddenError
+from google_air_quality_api.retry import RetryPolicy
+
+from .conftest import AuthCallback
+
+
+def fast_policy(**kwargs: float) -> RetryPolicy:
+    """Return a policy without noticeable delays."""
+    return RetryPolicy(base_delay=0.001, max_delay=0.002, **kwargs)
+
+
+async def test_retry_transient_errors(auth_cb: AuthCallback) -> None:
+    """Test 429 and 5xx responses are retried until they succeed."""
+    statuses = [429, 503, 200]
+
+    async def handler(_: web.Request) -> web.Response:
+        status = statuses.pop(0)
+        if status == 429:
+            return web.Response(status=status, headers={"Retry-After": "0"})
+        return web.json_response({"some-key": "some-value"}, status=status)
+
+    policy = fast_policy()
+    auth = await auth_cb([("/some-path", handler)], retry_policy=policy)
+
+    resp = await auth.post("some-path")
+    assert resp.status == 200
+    assert policy.stats.requests == 1
+    assert policy.stats.attempts == 3
+    assert policy.stats.retries == 2
+    assert policy.stats.amplification == 3
+
+
+async def test_retry_exhausted(auth_cb: AuthCallback) -> None:
+    """Test the last error is raised once all attempts failed."""
+    calls = 0
+
+    async def handler(_: web.Request) -> web.Response:
+        nonlocal calls
+        calls += 1
+        return web.Response(status=500)
+
+    policy = fast_policy(max_attempts=3)
+    auth = await auth_cb([("/some-path", handler)], retry_policy=policy)
+
+    with pytest.raises(ApiError, match=r"\(500\)"):
+        await auth.get("some-path")
+    assert calls == 3
+    assert policy.stats.exhausted == 1
+
+
+async def test_retry_deadline(auth_cb: AuthCallback) -> None:
+    """Test no retry is started that would exceed the deadline."""
+    calls = 0
+
+    async def handler(_: web.Request) -> web.Response:
+        nonlocal calls
+        calls += 1
+        return web.Response(status=429, headers={"Retry-After": "120"})
+
+    policy = fast_policy(deadline=60)
+    auth = await auth_cb([("/some-path", handler)], retry_policy=policy)
+
+    with pytest.raises(ApiError, match=r"\(429\)"):
+        await auth.get("some-path")
+    assert calls == 1
+
+
+async def test_terminal_errors_not_retried(auth_cb: AuthCallback) -> None:
+    """Test terminal errors are raised immediately."""
+    calls = 0
+
+    async def handler(_: web.Request) -> web.Response:
+        nonlocal calls
+        calls += 1
+        return web.Response(status=403)
+
+    policy = fast_policy()
+    auth = await auth_cb([("/some-path", handler)], retry_policy=policy)
+
+    with pytest.raises(ApiForbiddenError):
+        await auth.get("some-path")
+    assert calls == 1
+    assert policy.stats.retries == 0
+
+
+async def test_retry_connection_errors(auth_cb: AuthCallback) -> None:
+    """Test connection errors are retried and finally raised as ApiError."""
+    calls = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal calls
+        calls += 1
+        assert request.transport is not None
+        request.transport.close()
+        return web.Response()
+
+    policy = fast_policy(max_attempts=2)
+    auth = await auth_cb([("/some-path", handler)], retry_policy=policy)
+
+    with pytest.raises(ApiError, match="Error connecting to API"):
+        await auth.post("some-path")
+    assert calls == 2
+    assert policy.stats.exhausted == 1
+
+
+def test_invalid_policy() -> None:
+    """Test an invalid policy is rejected."""
+    with pytest.raises(ValueError, match="max_attempts"):
+        RetryPolicy(max_attempts=0)
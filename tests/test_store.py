@@ -0,0 +1,74 @@
+"""Tests for the persistent response store."""
+
+import sqlite3
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+from google_air_quality_api.api import GoogleAirQualityApi
+from google_air_quality_api.store import SQLiteResponseStore
+
+from .conftest import AuthCallback, FakeClock
+
+
+async def test_warm_restart(
+    auth_cb: AuthCallback,
+    tmp_path: Path,
+    air_quality_current_conditions_data: dict[str, Any],
+) -> None:
+    """Test responses are served from the store after a restart."""
+    requests: list[web.Request] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requests.append(request)
+        return web.json_response(air_quality_current_conditions_data)
+
+    date_time = datetime.fromisoformat(air_quality_current_conditions_data["dateTime"])
+    clock = FakeClock(date_time.timestamp() + 60)
+    path = tmp_path / "responses.db"
+
+    store = SQLiteResponseStore(path, clock=clock)
+    auth = await auth_cb([("/currentConditions:lookup", handler)], store=store)
+    first = await GoogleAirQualityApi(auth).async_get_current_conditions(1, 2)
+    await store.async_close()
+    assert len(requests) == 1
+
+    store = SQLiteResponseStore(path, clock=clock)
+    auth = await auth_cb([("/currentConditions:lookup", handler)], store=store)
+    api = GoogleAirQualityApi(auth)
+    assert await api.async_get_current_conditions(1, 2) == first
+    assert len(requests) == 1
+
+    # The API publishes new data an hour after the response dateTime.
+    clock.now = date_time.timestamp() + 3600
+    await api.async_get_current_conditions(1, 2)
+    assert len(requests) == 2
+    await store.async_close()
+
+    with sqlite3.connect(path) as db:
+        assert db.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+async def test_expiry_and_purge(tmp_path: Path) -> None:
+    """Test entries expire and expired entries are purged."""
+    clock = FakeClock(datetime(2025, 1, 1, 12, 30, tzinfo=UTC).timestamp())
+    store = SQLiteResponseStore(tmp_path / "responses.db", max_age=600, clock=clock)
+
+    await store.async_set("endpoint", "no-date", b"{}", object())
+    assert await store.async_get("no-date") == b"{}"
+    clock.now += 600
+    assert await store.async_get("no-date") is None
+
+    await store.async_purge()
+    await store.async_close()
+    with sqlite3.connect(tmp_path / "responses.db") as db:
+        assert db.execute("SELECT COUNT(*) FROM responses").fetchone() == (0,)
+
+
+async def test_store_errors_are_ignored(tmp_path: Path) -> None:
+    """Test a broken database does not fail lookups."""
+    store = SQLiteResponseStore(tmp_path)
+    assert await store.async_get("key") is None
+    await store.async_close()
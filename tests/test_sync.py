@@ -0,0 +1,40 @@
+"""Tests for the synchronous client."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from google_air_quality_api.exceptions import NoDataForLocationError
+from google_air_quality_api.model import AirQualityCurrentConditionsData
+from google_air_quality_api.sync import GoogleAirQualityClient
+from google_air_quality_api.testing import AirQualityEmulator
+
+
+def test_client(emulator: tuple[AirQualityEmulator, str]) -> None:
+    """Test calls from many threads share one session."""
+    server, host = emulator
+    with GoogleAirQualityClient("dummy-key", host=host, limit_per_host=4) as client:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(
+                    lambda lat: client.get_current_conditions(lat, 13.40),
+                    [50 + index * 0.1 for index in range(32)],
+                )
+            )
+        assert all(
+            isinstance(result, AirQualityCurrentConditionsData) for result in results
+        )
+        assert server.stats.requests["currentConditions"] == 32
+        stats = client.connection_stats()
+        assert stats.limit_per_host == 4
+        assert stats.in_use == 0
+        assert 0 < stats.idle <= 4
+
+        history = client.get_history(52.52, 13.40, hours=5)
+        assert len(history.hours_info) == 5
+        with pytest.raises(NoDataForLocationError):
+            client.get_current_conditions(5, 5)
+
+    with pytest.raises(RuntimeError, match="closed"):
+        client.get_current_conditions(52.52, 13.40)
+    client.close()
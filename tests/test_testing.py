@@ -0,0 +1,162 @@
+"""Tests for the Google Air Quality API emulator."""
+
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from aiohttp import ClientSession
+from aiohttp.web import Application
+
+from google_air_quality_api.api import GoogleAirQualityApi, Period
+from google_air_quality_api.auth import Auth
+from google_air_quality_api.exceptions import (
+    ApiError,
+    ApiForbiddenError,
+    InvalidCustomLAQIConfigurationError,
+    NoDataForLocationError,
+)
+from google_air_quality_api.grid import BoundingBox
+from google_air_quality_api.testing import AirQualityEmulator, fixed_latency
+
+from .conftest import FakeClock
+
+ClientFactory = Callable[[Application], Awaitable[ClientSession]]
+
+
+async def create_api(
+    aiohttp_client: ClientFactory, emulator: AirQualityEmulator
+) -> GoogleAirQualityApi:
+    """Return an API client talking to the emulator."""
+    client = await aiohttp_client(emulator.app())
+    return GoogleAirQualityApi(Auth(client, api_key="dummy-key", host="/v1"))
+
+
+async def test_current_conditions(aiohttp_client: ClientFactory) -> None:
+    """Test current conditions depend on the location."""
+    emulator = AirQualityEmulator()
+    api = await create_api(aiohttp_client, emulator)
+
+    berlin = await api.async_get_current_conditions(52.52, 13.40)
+    munich = await api.async_get_current_conditions(48.14, 11.58)
+    assert berlin.region_code == "de"
+    assert berlin.indexes.uaqi is not None
+    assert berlin.indexes.laqi is not None
+    assert berlin.indexes.laqi.code == "deu_uba"
+    assert berlin.indexes.laqi.category is not None
+    assert {pollutant.code for pollutant in berlin.pollutants} == {
+        "co",
+        "no2",
+        "o3",
+        "pm10",
+        "pm25",
+        "so2",
+    }
+    assert berlin.pollutants != munich.pollutants
+    assert emulator.stats.requests["currentConditions"] == 2
+
+
+async def test_custom_local_aqi(aiohttp_client: ClientFactory) -> None:
+    """Test custom local AQIs are honored and validated."""
+    api = await create_api(aiohttp_client, AirQualityEmulator())
+
+    result = await api.async_get_current_conditions(52.52, 13.40, "de", "usa_epa")
+    assert result.indexes.laqi is not None
+    assert result.indexes.laqi.code == "usa_epa"
+    with pytest.raises(InvalidCustomLAQIConfigurationError):
+        await api.async_get_current_conditions(52.52, 13.40, "de", "unknown")
+
+
+async def test_forecast_paging(aiohttp_client: ClientFactory) -> None:
+    """Test forecasts are served in pages."""
+    emulator = AirQualityEmulator()
+    api = await create_api(aiohttp_client, emulator)
+    start_time = datetime(2025, 5, 25, 8, tzinfo=UTC)
+
+    hours = [
+        hour
+        async for hour in api.async_iter_forecast(
+            52.52,
+            13.40,
+            Period(start_time, start_time + timedelta(hours=10)),
+            page_size=4,
+        )
+    ]
+    assert [hour.date_time for hour in hours] == [
+        start_time + timedelta(hours=offset) for offset in range(10)
+    ]
+    assert emulator.stats.requests["forecast"] == 3
+
+
+async def test_history(aiohttp_client: ClientFactory) -> None:
+    """Test history lookups return every requested hour."""
+    emulator = AirQualityEmulator()
+    api = await create_api(aiohttp_client, emulator)
+
+    history = await api.async_get_history(52.52, 13.40, hours=30, page_size=12)
+    assert len(history.hours_info) == 30
+    assert history.hours_info[0].date_time < history.hours_info[-1].date_time
+    assert emulator.stats.requests["history"] == 3
+
+
+async def test_no_data_region(aiohttp_client: ClientFactory) -> None:
+    """Test locations in a no data region raise NoDataForLocationError."""
+    emulator = AirQualityEmulator(no_data_regions=[BoundingBox(0, 0, 10, 10)])
+    api = await create_api(aiohttp_client, emulator)
+
+    with pytest.raises(NoDataForLocationError):
+        await api.async_get_current_conditions(5, 5)
+    await api.async_get_current_conditions(52.52, 13.40)
+    assert emulator.stats.no_data == 1
+
+
+async def test_injected_errors(aiohttp_client: ClientFactory) -> None:
+    """Test injected server errors and latency."""
+    emulator = AirQualityEmulator(error_rate=1.0, latency=fixed_latency(0.001), seed=1)
+    api = await create_api(aiohttp_client, emulator)
+
+    with pytest.raises(ApiError, match=r"\(503\)"):
+        await api.async_get_current_conditions(52.52, 13.40)
+    assert emulator.stats.errors == 1
+
+
+async def test_quota(aiohttp_client: ClientFactory) -> None:
+    """Test requests beyond the quota are rejected until the window ends."""
+    clock = FakeClock()
+    emulator = AirQualityEmulator(quota=2, quota_window=60, clock=clock)
+    client = await aiohttp_client(emulator.app())
+    api = GoogleAirQualityApi(Auth(client, api_key="dummy-key", host="/v1"))
+
+    await api.async_get_current_conditions(52.52, 13.40)
+    await api.async_get_current_conditions(52.52, 13.40)
+    clock.now = 15
+    resp = await client.post(
+        "/v1/currentConditions:lookup",
+        json={"location": {"latitude": 52.52, "longitude": 13.40}},
+    )
+    assert resp.status == 429
+    assert resp.headers["Retry-After"] == "45"
+    clock.now = 60
+    await api.async_get_current_conditions(52.52, 13.40)
+    assert emulator.stats.throttled == 1
+
+
+async def test_api_key(aiohttp_client: ClientFactory) -> None:
+    """Test requests with a wrong API key are rejected."""
+    emulator = AirQualityEmulator(api_key="secret")
+    api = await create_api(aiohttp_client, emulator)
+
+    with pytest.raises(ApiForbiddenError):
+        await api.async_get_current_conditions(52.52, 13.40)
+
+
+async def test_start_stop() -> None:
+    """Test serving the emulator on a local port."""
+    emulator = AirQualityEmulator()
+    host = await emulator.async_start()
+    try:
+        async with ClientSession() as session:
+            api = GoogleAirQualityApi(Auth(session, "dummy-key", host=host))
+            result = await api.async_get_current_conditions(52.52, 13.40)
+    finally:
+        await emulator.async_stop()
+    assert result.region_code == "de"
@@ -0,0 +1,113 @@
+"""Tests for heatmap tiles and the tile cache."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+from google_air_quality_api.api import GoogleAirQualityApi
+from google_air_quality_api.tiles import TileCache
+
+from .conftest import AuthCallback, FakeClock
+
+
+def test_tile_cache_memory() -> None:
+    """Test the byte budget, LRU eviction and expiry in memory."""
+    clock = FakeClock()
+    cache = TileCache(max_bytes=10, ttl=60, clock=clock)
+
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    hit = cache.get("a")
+    assert isinstance(hit, memoryview)
+    assert hit.readonly
+    assert hit == b"aaaa"
+
+    cache.set("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.size_bytes == 8
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+    cache.set("big", b"x" * 11)
+    assert cache.get("big") is None
+
+    clock.now = 60
+    assert cache.get("a") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 3
+
+
+def test_tile_cache_spill(tmp_path: Path) -> None:
+    """Test evicted tiles are served from memory-mapped files."""
+    cache = TileCache(max_bytes=4, spill_dir=tmp_path, spill_max_bytes=8)
+
+    cache.set("m/1/2/3", b"1111")
+    cache.set("m/1/2/4", b"2222")
+    assert cache.size_bytes == 4
+    assert cache.spilled_bytes == 4
+    spilled = cache.get("m/1/2/3")
+    assert spilled == b"1111"
+    assert spilled is not None
+    assert spilled.readonly
+
+    cache.set("m/1/2/5", b"3333")
+    cache.set("m/1/2/6", b"4444")
+    assert cache.spilled_bytes == 8
+    # The oldest spilled tile was dropped while its view is still alive.
+    assert cache.get("m/1/2/3") is None
+    assert spilled == b"1111"
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "m_1_2_4.1.tile",
+        "m_1_2_5.2.tile",
+    ]
+
+    cache.set("m/1/2/4", b"5555")
+    assert cache.get("m/1/2/4") == b"5555"
+    cache.clear()
+    assert len(cache) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_tile_cache_async_spill(tmp_path: Path) -> None:
+    """Test tiles evicted on the event loop are spilled in a worker thread."""
+    cache = TileCache(max_bytes=4, spill_dir=tmp_path)
+
+    await cache.async_set("m/1/2/3", b"1111")
+    await cache.async_set("m/1/2/4", b"2222")
+    assert cache.spilled_bytes == 4
+    assert cache.get("m/1/2/3") == b"1111"
+
+    # A tile stored again while its evicted copy is written keeps the new data.
+    await asyncio.gather(
+        cache.async_set("m/1/2/5", b"3333"), cache.async_set("m/1/2/4", b"5555")
+    )
+    assert cache.get("m/1/2/4") == b"5555"
+    assert cache.get("m/1/2/5") == b"3333"
+    assert cache.spilled_bytes == 8
+
+
+async def test_async_get_heatmap_tile(auth_cb: AuthCallback) -> None:
+    """Test heatmap tiles are fetched once and then served from the cache."""
+    requests: list[web.Request] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requests.append(request)
+        return web.Response(body=b"\x89PNG", content_type="image/png")
+
+    auth = await auth_cb([("/mapTypes/UAQI_RED_GREEN/heatmapTiles/2/0/1", handler)])
+    api = GoogleAirQualityApi(auth, tile_cache=TileCache())
+
+    tile = await api.async_get_heatmap_tile("UAQI_RED_GREEN", 2, 0, 1)
+    assert tile == b"\x89PNG"
+    assert await api.async_get_heatmap_tile("UAQI_RED_GREEN", 2, 0, 1) == tile
+    assert len(requests) == 1
+
+    uncached = GoogleAirQualityApi(auth)
+    assert await uncached.async_get_heatmap_tile("UAQI_RED_GREEN", 2, 0, 1) == tile
+    assert len(requests) == 2
+
+    with pytest.raises(ValueError, match="Unknown heatmap map type"):
+        await api.async_get_heatmap_tile("UAQI", 2, 0, 1)
+    assert len(requests) == 2
@@ -0,0 +1,72 @@
+"""Tests for tracing API calls."""
+
+from collections.abc import Awaitable, Callable
+
+import pytest
+from aiohttp import ClientSession
+from aiohttp.web import Application
+
+from google_air_quality_api import tracing
+from google_air_quality_api.api import GoogleAirQualityApi
+from google_air_quality_api.auth import Auth
+from google_air_quality_api.testing import AirQualityEmulator
+
+ClientFactory = Callable[[Application], Awaitable[ClientSession]]
+
+
+def test_noop_span(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test spans are no-ops without OpenTelemetry."""
+    monkeypatch.setattr(tracing, "_TRACER", None)
+
+    with tracing.span(tracing.REQUEST_SPAN) as span:
+        assert span is tracing.NOOP_SPAN
+        assert not span.is_recording()
+        span.set_attribute(tracing.ENDPOINT_ATTRIBUTE, "ignored")
+
+
+async def test_spans(
+    aiohttp_client: ClientFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the spans of a current conditions lookup."""
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider  # noqa: PLC0415
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: PLC0415
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: PLC0415
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing, "_TRACER", provider.get_tracer(tracing.TRACER_NAME))
+    client = await aiohttp_client(AirQualityEmulator().app())
+    api = GoogleAirQualityApi(Auth(client, api_key="dummy-key", host="/v1"))
+
+    await api.async_get_current_conditions(52.52, 13.40)
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert set(spans) == {
+        tracing.CURRENT_CONDITIONS_SPAN,
+        tracing.REQUEST_SPAN,
+        tracing.NETWORK_SPAN,
+        tracing.READ_BODY_SPAN,
+        tracing.DESERIALIZE_SPAN,
+    }
+    root = spans[tracing.CURRENT_CONDITIONS_SPAN]
+    assert root.attributes == {
+        tracing.REGION_CODE_ATTRIBUTE: "de",
+        tracing.LAQI_ATTRIBUTE: "deu_uba",
+    }
+    request = spans[tracing.REQUEST_SPAN]
+    assert request.attributes == {
+        tracing.ENDPOINT_ATTRIBUTE: "currentConditions:lookup",
+        tracing.METHOD_ATTRIBUTE: "POST",
+        tracing.STATUS_ATTRIBUTE: 200,
+    }
+    assert spans[tracing.NETWORK_SPAN].parent.span_id == request.context.span_id
+    for name in (
+        tracing.REQUEST_SPAN,
+        tracing.READ_BODY_SPAN,
+        tracing.DESERIALIZE_SPAN,
+    ):
+        assert spans[name].parent.span_id == root.context.span_id